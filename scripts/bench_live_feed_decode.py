@@ -0,0 +1,80 @@
+"""Compare the dict-based and columnar live feed decoders.
+
+Usage: `python scripts/bench_live_feed_decode.py [NUM_FLIGHTS]`
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+
+import polars as pl
+
+from fr24.grpc import live_feed_df, live_feed_flightdata_dict
+from fr24.proto.v1_pb2 import (
+    ExtraFlightInfo,
+    Flight,
+    LiveFeedResponse,
+    PositionBuffer,
+    RecentPosition,
+    Route,
+    Schedule,
+)
+from fr24.types.cache import live_feed_schema
+
+
+def make_response(num_flights: int, seed: int = 0) -> LiveFeedResponse:
+    rng = random.Random(seed)
+    return LiveFeedResponse(
+        flights_list=[
+            Flight(
+                flightid=i,
+                lat=rng.uniform(-90, 90),
+                lon=rng.uniform(-180, 180),
+                track=rng.randrange(360),
+                alt=rng.randrange(45000),
+                speed=rng.randrange(600),
+                callsign=f"CPA{i}",
+                timestamp_ms=1_700_000_000_000 + rng.randrange(60_000),
+                extra_info=ExtraFlightInfo(
+                    reg="B-HNR",
+                    route=Route(**{"from": "HKG", "to": "LHR"}),
+                    type="B77W",
+                    schedule=Schedule(eta=rng.randrange(1 << 31)),
+                    squawk=rng.randrange(0o7777),
+                    vspeed=rng.randrange(-4000, 4000),
+                ),
+                position_buffer=PositionBuffer(
+                    recent_positions_list=[
+                        RecentPosition(
+                            delta_lat=rng.randrange(-1000, 1000),
+                            delta_lon=rng.randrange(-1000, 1000),
+                            delta_ms=rng.randrange(10_000),
+                        )
+                        for _ in range(rng.randrange(8))
+                    ]
+                ),
+            )
+            for i in range(num_flights)
+        ]
+    )
+
+
+def live_feed_df_dicts(data: LiveFeedResponse) -> pl.DataFrame:
+    return pl.DataFrame(
+        (live_feed_flightdata_dict(lfr) for lfr in data.flights_list),
+        schema=live_feed_schema,
+    )
+
+
+def main(num_flights: int = 20_000, repeat: int = 5) -> None:
+    data = make_response(num_flights)
+    assert live_feed_df(data).equals(live_feed_df_dicts(data))
+    for name, fn in (("dicts", live_feed_df_dicts), ("columnar", live_feed_df)):
+        best = min(timeit.repeat(lambda: fn(data), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1e3:8.1f} ms for {num_flights} flights")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
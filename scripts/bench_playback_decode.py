@@ -0,0 +1,79 @@
+"""Compare the dict-based and columnar playback track decoders.
+
+Usage: `python scripts/bench_playback_decode.py [NUM_POINTS]`
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from typing import Any
+
+import polars as pl
+
+from fr24.json import playback_track_df, playback_track_dict
+from fr24.types.cache import playback_track_schema
+
+
+def make_track(num_points: int, seed: int = 0) -> list[Any]:
+    rng = random.Random(seed)
+    track = []
+    for i in range(num_points):
+        timestamp = 1_700_000_000 + i * 5
+        ems = {
+            "ts": timestamp,
+            "ias": rng.randrange(300),
+            "tas": rng.randrange(500),
+            "mach": rng.randrange(900),
+            "mcp": None,
+            "fms": 35000,
+            "autopilot": None,
+            "oat": -50,
+            "trueTrack": rng.uniform(0, 360),
+            "rollAngle": rng.uniform(-30, 30),
+            "qnh": None,
+            "windDir": rng.randrange(360),
+            "windSpd": rng.randrange(150),
+            "precision": 3,
+            "altGPS": rng.randrange(40000),
+            "emergencyStatus": 0,
+            "tcasAcasDtatus": 0,
+            "heading": rng.randrange(360),
+        }
+        track.append(
+            {
+                "latitude": rng.uniform(-90, 90),
+                "longitude": rng.uniform(-180, 180),
+                "altitude": {"feet": rng.randrange(45000), "meters": 0},
+                "speed": {"kts": rng.randrange(600), "kmh": 0.0, "mph": 0.0},
+                "verticalSpeed": {"fpm": rng.randrange(-4000, 4000), "ms": 0},
+                "heading": rng.randrange(360),
+                "squawk": f"{rng.randrange(0o10000):04o}",
+                "timestamp": timestamp,
+                "ems": ems if i % 3 == 0 else None,
+            }
+        )
+    return track
+
+
+def playback_track_df_dicts(track: list[Any]) -> pl.DataFrame:
+    return pl.DataFrame(
+        [playback_track_dict(point) for point in track],
+        schema=playback_track_schema,
+    )
+
+
+def main(num_points: int = 5_000, repeat: int = 5) -> None:
+    track = make_track(num_points)
+    assert playback_track_df(track).equals(playback_track_df_dicts(track))
+    for name, fn in (
+        ("dicts", playback_track_df_dicts),
+        ("columnar", playback_track_df),
+    ):
+        best = min(timeit.repeat(lambda: fn(track), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1e3:8.1f} ms for {num_points} points")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -6,12 +6,14 @@ from typing import TYPE_CHECKING
 
 import httpx
 
+from .archive import ResponseArchive
 from .authentication import login
-from .cache import PATH_CACHE, FR24Cache
+from .cache import PATH_CACHE, FR24Cache, ResponseCache
 from .configuration import FP_CONFIG_FILE, PATH_CONFIG
 from .grpc import BoundingBox
 from .json import get_json_headers
 from .proto.headers import get_grpc_headers
+from .ratelimit import RateLimiter
 from .service import ServiceFactory
 from .static.bbox import LNGS_WORLD_STATIC
 from .types.json import Authentication
@@ -34,6 +36,9 @@ class FR24:
     def __init__(
         self,
         client: httpx.AsyncClient | None = None,
+        ratelimiter: RateLimiter | Literal["default"] | None = "default",
+        response_cache: ResponseCache | None = None,
+        archive: ResponseArchive | None = None,
     ) -> None:
         """See docs [quickstart](../usage/quickstart.md#initialisation).
 
@@ -42,19 +47,51 @@ class FR24:
             highly recommended to use `http2=True` to avoid
             [464 errors](https://github.com/abc8747/fr24/issues/23#issuecomment-2125624974)
             and to be consistent with the browser.
+        :param ratelimiter: Paces the requests of all services, backing off
+            and retrying when the server throttles us. It wraps the
+            transport of the client created when `client` is not given.
+            A given `client` is left alone by `default`: either create it
+            with [RateLimiter.transport][fr24.ratelimit.RateLimiter.transport]
+            or pass a limiter explicitly to
+            [install][fr24.ratelimit.RateLimiter.install] it on the client.
+            Pass the same instance to several `FR24` to share the budget, or
+            `None` to disable it.
+        :param response_cache: Opt-in read-through cache: fetches are served
+            from it while the cached response is fresh under its per-endpoint
+            time-to-live, e.g. `FR24Cache.default().responses`. Note that
+            responses are not keyed by the authentication state.
+        :param archive: Archive the raw body of every successful response,
+            e.g. `FR24Cache.default().archive`, to reprocess them later with
+            [fr24.service.replay][].
         """
+        self.response_cache = response_cache
+        self.archive = archive
         auth = None
+        if ratelimiter == "default":
+            ratelimiter = RateLimiter() if client is None else None
+        if client is None:
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+                http2=True
+            )
+            if ratelimiter is not None:
+                transport = ratelimiter.transport(transport)
+            client = httpx.AsyncClient(http2=True, transport=transport)
+        elif ratelimiter is not None:
+            ratelimiter.install(client)
         self.http = HTTPClient(
-            httpx.AsyncClient(http2=True) if client is None else client,
+            client,
             auth=auth,
             grpc_headers=httpx.Headers(get_grpc_headers(auth=auth)),
             json_headers=httpx.Headers(get_json_headers()),
+            ratelimiter=ratelimiter,
         )
         """The HTTP client for use in requests"""
         self._build_factory(self.http)
 
     def _build_factory(self, http: HTTPClient) -> None:
-        factory = ServiceFactory(http)
+        factory = ServiceFactory(
+            http, response_cache=self.response_cache, archive=self.archive
+        )
         self.flight_list = factory.build_flight_list()
         """Flight list service."""
         self.playback = factory.build_playback()
@@ -115,6 +152,8 @@ class HTTPClient:
     auth: Authentication | None
     grpc_headers: httpx.Headers
     json_headers: httpx.Headers
+    ratelimiter: RateLimiter | None = None
+    """Per-host rate limits, shared by all services using this client."""
 
     async def with_login(
         self,
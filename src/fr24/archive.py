@@ -0,0 +1,237 @@
+"""Lossless, compact storage of raw API responses for offline reprocessing.
+
+Each response body is compressed into its own zstd frame and appended to a
+segment file. Bodies are content-addressed, so identical responses are
+stored once. A SQLite index maps each request (endpoint, parameters and
+timestamp) to its body.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple
+
+import orjson
+
+from .utils import _json_default, to_unix_timestamp
+
+if TYPE_CHECKING:
+    from .types import IntoTimestamp, IntTimestampS
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    endpoint TEXT NOT NULL,
+    request_key TEXT NOT NULL,
+    request TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash)
+);
+CREATE INDEX IF NOT EXISTS entries_endpoint_timestamp
+    ON entries(endpoint, timestamp);
+CREATE INDEX IF NOT EXISTS entries_request_key ON entries(request_key);
+"""
+
+
+class ArchiveEntry(NamedTuple):
+    endpoint: str
+    request: Any
+    """The request parameters as JSON, see [fr24.archive.request_json][].
+    [fr24.service.replay][] rebuilds them into e.g.
+    [fr24.grpc.LiveFeedParams][]."""
+    timestamp: IntTimestampS
+    """Server time when the response was received."""
+    hash: str
+    """SHA-256 of the response body."""
+
+
+class ResponseArchive:
+    """An append-only archive of raw response bodies.
+
+    See [fr24.service.replay][] to rebuild results from it.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        segment_size: int = 256 * 1024 * 1024,
+        level: int = 10,
+    ) -> None:
+        """
+        :param path: Directory holding the index and segment files. It is
+            created on the first write.
+        :param segment_size: Start a new segment file once the current one
+            exceeds this many bytes.
+        :param level: zstd compression level.
+        """
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.level = level
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # writes happen in worker threads, see `ServiceFactory.send`
+            self._db = sqlite3.connect(
+                self.path / "index.sqlite", timeout=60, check_same_thread=False
+            )
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    def segment_path(self, segment: int) -> Path:
+        return self.path / f"{segment:05d}.zst"
+
+    def _current_segment(self) -> int:
+        (segment,) = self.db.execute(
+            "SELECT COALESCE(MAX(segment), 0) FROM blobs"
+        ).fetchone()
+        fp = self.segment_path(segment)
+        if fp.exists() and fp.stat().st_size >= self.segment_size:
+            segment += 1
+        return int(segment)
+
+    def put(
+        self,
+        endpoint: str,
+        request: Any,
+        content: bytes,
+        timestamp: IntTimestampS,
+    ) -> str:
+        """Archive a response body. Returns the hash of the body.
+
+        This compresses the body and blocks on the index: async callers
+        should run it in a worker thread. Calls are serialised.
+
+        :param request: The request parameters. They are stored as JSON,
+            see [fr24.archive.request_json][].
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        canonical = request_json(request)
+        with self._lock, self.db as db:
+            # take the write lock upfront: appending to the segment must be
+            # serialised across processes
+            db.execute("BEGIN IMMEDIATE")
+            if (
+                db.execute(
+                    "SELECT 1 FROM blobs WHERE hash = ?", (digest,)
+                ).fetchone()
+                is None
+            ):
+                import zstandard
+
+                frame = zstandard.ZstdCompressor(level=self.level).compress(
+                    content
+                )
+                segment = self._current_segment()
+                with open(self.segment_path(segment), "ab") as f:
+                    offset = f.tell()
+                    f.write(frame)
+                db.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (digest, segment, offset, len(frame), len(content)),
+                )
+            db.execute(
+                "INSERT INTO entries "
+                "(endpoint, request_key, request, timestamp, hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    endpoint,
+                    _hash_request(canonical),
+                    canonical.decode(),
+                    timestamp,
+                    digest,
+                ),
+            )
+        return digest
+
+    def get(self, hash: str) -> bytes:
+        """Read the response body with the given hash."""
+        row = self.db.execute(
+            "SELECT segment, offset, length FROM blobs WHERE hash = ?",
+            (hash,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(hash)
+        segment, offset, length = row
+        with open(self.segment_path(segment), "rb") as f:
+            f.seek(offset)
+            frame = f.read(length)
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(frame)
+
+    def entries(
+        self,
+        endpoint: str | None = None,
+        *,
+        request: Any | None = None,
+        start: IntoTimestamp | None = None,
+        end: IntoTimestamp | None = None,
+    ) -> Iterator[ArchiveEntry]:
+        """Iterate over archived responses in chronological order.
+
+        :param endpoint: Only include this endpoint, e.g. `live_feed`.
+        :param request: Only include responses to these request parameters.
+        :param start: Only include responses at or after this time.
+        :param end: Only include responses before this time.
+        """
+        clauses: list[str] = []
+        args: list[Any] = []
+        if endpoint is not None:
+            clauses.append("endpoint = ?")
+            args.append(endpoint)
+        if request is not None:
+            clauses.append("request_key = ?")
+            args.append(request_key(request))
+        for op, ts in ((">=", start), ("<", end)):
+            if ts is not None:
+                clauses.append(f"timestamp {op} ?")
+                args.append(to_unix_timestamp(ts))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        for row in self.db.execute(
+            "SELECT endpoint, request, timestamp, hash FROM entries "
+            f"{where} ORDER BY timestamp, id",
+            args,
+        ):
+            yield ArchiveEntry(row[0], orjson.loads(row[1]), row[2], row[3])
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def request_json(request: Any) -> bytes:
+    """Serialise the request parameters to canonical JSON, with sorted keys
+    and sets, so that it does not depend on `PYTHONHASHSEED`."""
+    if dataclasses.is_dataclass(request) and not isinstance(request, type):
+        request = dataclasses.asdict(request)
+    return orjson.dumps(
+        request, default=_json_default, option=orjson.OPT_SORT_KEYS
+    )
+
+
+def request_key(request: Any) -> str:
+    """Hash of the [canonical JSON][fr24.archive.request_json] of the
+    request parameters."""
+    return _hash_request(request_json(request))
+
+
+def _hash_request(canonical: bytes) -> str:
+    return hashlib.sha256(canonical).hexdigest()[:32]
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import logging
+import sqlite3
+import sys
+import time
+from dataclasses import field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Protocol
+from typing import TYPE_CHECKING, Any, Mapping, Protocol, get_args
 
+import httpx
+import orjson
 from platformdirs import user_cache_dir
+from typing_extensions import TypedDict, Unpack
 
+from .archive import ResponseArchive, request_key
 from .types.cache import (
+    TabularFileFmt,
     flight_details_schema,
     flight_list_schema,
     live_feed_schema,
@@ -13,11 +24,16 @@ from .types.cache import (
     nearest_flights_schema,
     playback_flight_schema,
     playback_track_schema,
+    profile_schema,
     top_flights_schema,
 )
 from .utils import (
     BarePath,
+    atomic_write,
     dataclass_frozen,
+    dir_lock,
+    format_bare_path,
+    read_table_metadata,
     scan_table,
     to_flight_id,
     to_unix_timestamp,
@@ -29,54 +45,193 @@ if TYPE_CHECKING:
     import polars as pl
     from typing_extensions import Literal
 
-    from .types import IntoFlightId, IntoTimestamp
-    from .types.cache import TabularFileFmt
+    from .types import (
+        IntFlightId,
+        IntoFlightId,
+        IntoTimestamp,
+        IntTimestampS,
+    )
+    from .types.cache import CacheLayout, SchemaProfile
 
 
+logger = logging.getLogger(__name__)
 PATH_CACHE = Path(user_cache_dir("fr24"))
 
 
+def _scan_files(
+    files: list[Path],
+    format: TabularFileFmt,
+    schema: dict[str, pl.DataType],
+    *,
+    include_file_paths: str | None = None,
+) -> pl.LazyFrame:
+    """Lazily load many files of the same schema with a single scan."""
+    import polars as pl
+
+    if format == "parquet":
+        return pl.scan_parquet(
+            files, schema=schema, include_file_paths=include_file_paths
+        )
+    elif format == "csv":
+        return pl.scan_csv(
+            files, schema=schema, include_file_paths=include_file_paths
+        )
+    elif format == "arrow":
+        lf = pl.scan_ipc(files, include_file_paths=include_file_paths)
+        return lf.cast(schema)  # type: ignore[arg-type]
+    raise ValueError(f"unsupported format: `{format}`")
+
+
+def _flight_id_column(ident: pl.Expr) -> pl.Expr:
+    import polars as pl
+
+    return ident.str.to_integer(base=16).cast(pl.UInt64())
+
+
+def _snapshot_ts_column(ident: pl.Expr) -> pl.Expr:
+    import polars as pl
+
+    return (
+        (ident.cast(pl.Int64()) * 1000)
+        .cast(pl.Datetime("ms"))
+        .dt.replace_time_zone("UTC")
+    )
+
+
 class FR24Cache:
+    """Tabular files, raw responses and their indices on disk.
+
+    It is safe for concurrent writers, including across processes (e.g.
+    several recorders sharing a cache directory): files are written to a
+    temporary file and atomically renamed into place, handling of existing
+    files is serialised with advisory locks (see [fr24.utils.atomic_write][]),
+    and the SQLite indices wait for each other's transactions. Readers
+    never observe a partially written file.
+    """
+
     @classmethod
-    def default(cls) -> FR24Cache:
+    def default(
+        cls,
+        *,
+        layout: CacheLayout = "flat",
+        limits: CacheLimits | None = None,
+        profile: SchemaProfile = "default",
+    ) -> FR24Cache:
         """Create a cache in the
         [default directory](../usage/cli.md#directories)."""
-        return cls(PATH_CACHE)
+        return cls(PATH_CACHE, layout=layout, limits=limits, profile=profile)
 
-    def __init__(self, path: Path | str) -> None:
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        layout: CacheLayout = "flat",
+        limits: CacheLimits | None = None,
+        profile: SchemaProfile = "default",
+    ) -> None:
+        """
+        :param path: Root directory of the cache.
+        :param layout: File layout of the timestamped collections
+            (live feed, live flights status, top flights), see
+            [fr24.cache.TimestampedCache.layout][].
+        :param limits: Disk budget, enforced periodically on write. By
+            default, the cache grows without bound: see
+            [fr24.cache.FR24Cache.gc][] to enforce it manually.
+        :param profile: Column types of the tables written to and read from
+            the tabular collections, see [fr24.types.cache.SchemaProfile][].
+            Files of different profiles cannot be scanned together, so a
+            cache directory should stick to one profile.
+        """
         self.path = Path(path)
-        flight_list_dir = self.path / "flight_list"
+        self.manifest = CacheManifest(self.path, limits)
+
+        def collection(*parts: str) -> Collection:
+            return Collection(
+                self.path.joinpath(*parts), self.manifest, profile
+            )
 
         self.flight_list = FlightListBy(
-            reg=FlightListRegCache(Collection(flight_list_dir / "reg")),
-            flight=FlightListFlightCache(
-                Collection(flight_list_dir / "flight")
-            ),
+            reg=FlightListRegCache(collection("flight_list", "reg")),
+            flight=FlightListFlightCache(collection("flight_list", "flight")),
         )
-        self.playback = PlaybackCache(Collection(self.path / "playback"))
+        self.playback = PlaybackCache(collection("playback"))
         self.live_feed = TimestampedCache(
-            Collection(self.path / "feed"), schema=live_feed_schema
+            collection("feed"), schema=live_feed_schema, layout=layout
         )
         self.nearest_flights = NearestFlightsCache(
-            Collection(self.path / "nearest_flights")
+            collection("nearest_flights")
         )
         self.live_flights_status = TimestampedCache(
-            Collection(self.path / "live_flights_status"),
+            collection("live_flights_status"),
             schema=live_flights_status_schema,
+            layout=layout,
         )
         self.top_flights = TimestampedCache(
-            Collection(self.path / "top_flights"), schema=top_flights_schema
+            collection("top_flights"),
+            schema=top_flights_schema,
+            layout=layout,
         )
         self.flight_details = FlightDetailsCache(
-            Collection(self.path / "flight_details"),
+            collection("flight_details"),
             schema=flight_details_schema,
         )
         self.playback_flight = FlightDetailsCache(
-            Collection(self.path / "playback_flight"),
+            collection("playback_flight"),
             schema=playback_flight_schema,
         )
+        self.responses = ResponseCache(self.path / "responses")
+        self.archive = ResponseArchive(self.path / "archive")
         # mkdir not necessary: write_table will create them automatically
 
+    def caches(self) -> list[GlobMixin]:
+        """All collections of tabular files in this cache."""
+        return [
+            self.flight_list.reg,
+            self.flight_list.flight,
+            self.playback,
+            self.live_feed,
+            self.nearest_flights,
+            self.live_flights_status,
+            self.top_flights,
+            self.flight_details,
+            self.playback_flight,
+        ]
+
+    def reindex(self) -> int:
+        """Rebuild the [manifest][fr24.cache.CacheManifest] from the files
+        on disk, e.g. for files written before the manifest existed.
+
+        Returns the number of files indexed.
+        """
+        import polars as pl
+
+        self.manifest.clear()
+        num_files = 0
+        for cache in self.caches():
+            for file in cache.glob("**/*"):
+                if file.suffix[1:] not in get_args(TabularFileFmt):
+                    continue  # e.g. backups
+                keys = cache.parse_ident(file.stem)
+                if keys is None:
+                    continue
+                num_rows = file.scan_table().select(pl.len()).collect().item()
+                self.manifest.record(
+                    cache.collection, file, file.format, num_rows, keys
+                )
+                num_files += 1
+        return num_files
+
+    def gc(self, limits: CacheLimits | None = None) -> list[Path]:
+        """Delete the oldest files until the cache is within budget.
+
+        Returns the deleted files.
+
+        :param limits: Defaults to the limits the cache was created with.
+        """
+        if (limits := limits or self.manifest.limits) is None:
+            raise ValueError("no limits to enforce")
+        return self.manifest.evict(limits)
+
 
 class CacheLike(Protocol):
     collection: Collection
@@ -89,21 +244,103 @@ class CacheLike(Protocol):
         """Lazily load a file from this collection."""
         ...
 
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        """Schema of each file in this collection, under the default
+        profile."""
+        ...
+
 
 @dataclass_frozen
 class GlobMixin(CacheLike):
     def glob(self, pattern: str) -> Generator[File, None, None]:
-        """Yield all scannable files matching the given pattern."""
+        """Yield all scannable files matching the given pattern.
+
+        This walks the filesystem: prefer [query][fr24.cache.GlobMixin.query]
+        for large collections.
+        """
         for fp in self.collection.path.glob(pattern):
             yield File(fp)
 
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        """Recover the keys of a file from its name (without the extension),
+        or `None` if the name is not recognised."""
+        return {}
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        """Columns derived from the name of a file (without the extension),
+        added to each row by [scan_all][fr24.cache.GlobMixin.scan_all]."""
+        return {}
+
+    def scan_all(self, *, format: TabularFileFmt = "parquet") -> pl.LazyFrame:
+        """Lazily load every file of this collection as a single frame, with
+        extra columns identifying the file of each row (e.g. `flight_id`).
+
+        Files are listed from the manifest (see
+        [fr24.cache.FR24Cache.reindex][]) and scanned together by polars, so
+        that projections and filters run in parallel across files:
+
+        ```py
+        cache.playback.scan_all().filter(pl.col("altitude") > 30000)
+        ```
+        """
+        import polars as pl
+
+        schema = profile_schema(self.table_schema, self.collection.profile)
+        files: list[Path] = [*self.query(format=format)]
+        if files:
+            lf = _scan_files(files, format, schema, include_file_paths="_file")
+        else:
+            lf = pl.LazyFrame(schema={**schema, "_file": pl.String})
+        ident = pl.col("_file").str.extract(r"([^/\\]+)\.\w+$")
+        return lf.with_columns(**self.ident_columns(ident)).drop("_file")
+
+    def query(
+        self,
+        *,
+        key: str | None = None,
+        flight_id: IntoFlightId | None = None,
+        start: IntoTimestamp | str | None = None,
+        end: IntoTimestamp | str | None = None,
+        format: TabularFileFmt | None = None,
+    ) -> list[File]:
+        """List files of this collection from the manifest, sorted by
+        timestamp.
+
+        :param key: Registration, flight number, or `{lon6}_{lat6}` for
+            nearest flights.
+        :param flight_id: Flight ID of playback and flight details files.
+        :param start: Only include files at or after this time. Compacted
+            files are included if their last snapshot is at or after it.
+        :param end: Only include files before this time.
+        :param format: Only include files of this format.
+        """
+        return self.collection.manifest.query(
+            self.collection,
+            key=key,
+            flight_id=flight_id,
+            start=start,
+            end=end,
+            format=format,
+        )
+
 
 @dataclass_frozen
 class FlightListRegCache(GlobMixin):
     collection: Collection
 
     def get_path(self, reg: str) -> BarePath:
-        return self.collection.new_bare_path(reg.upper())
+        return self.collection.new_bare_path(reg.upper(), key=reg.upper())
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        return {"key": ident}
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return flight_list_schema
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        return {"key": ident}
 
     def scan_table(
         self, reg: str, *, format: TabularFileFmt = "parquet"
@@ -122,7 +359,17 @@ class FlightListFlightCache(GlobMixin):
     collection: Collection
 
     def get_path(self, flight: str) -> BarePath:
-        return self.collection.new_bare_path(flight.upper())
+        return self.collection.new_bare_path(flight.upper(), key=flight.upper())
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        return {"key": ident}
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return flight_list_schema
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        return {"key": ident}
 
     def scan_table(
         self, flight: str, *, format: TabularFileFmt = "parquet"
@@ -152,8 +399,22 @@ class PlaybackCache(GlobMixin):
     collection: Collection
 
     def get_path(self, flight_id: IntoFlightId) -> BarePath:
-        ident = f"{to_flight_id(flight_id):0x}".upper()
-        return self.collection.new_bare_path(ident)
+        fid = to_flight_id(flight_id)
+        ident = f"{fid:0x}".upper()
+        return self.collection.new_bare_path(ident, flight_id=fid)
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        try:
+            return {"flight_id": int(ident, 16)}
+        except ValueError:
+            return None
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return playback_track_schema
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        return {"flight_id": _flight_id_column(ident)}
 
     def scan_table(
         self, flight_id: IntoFlightId, *, format: TabularFileFmt = "parquet"
@@ -174,12 +435,291 @@ class PlaybackCache(GlobMixin):
 class TimestampedCache(GlobMixin):
     collection: Collection
     schema: dict[str, pl.DataType]
+    layout: CacheLayout = "flat"
+    """How files are laid out in the collection directory:
+
+    - `flat`: `{timestamp}.parquet`
+    - `hive`: `date=YYYY-MM-DD/hour=HH/{timestamp}.parquet`, so that a
+      time range only touches the relevant partitions
+    """
 
     def get_path(self, timestamp: IntoTimestamp | str) -> BarePath:
         ts = to_unix_timestamp(timestamp)
         if ts is None or ts == "now":
             raise ValueError(f"invalid timestamp for cache: {timestamp}")
-        return self.collection.new_bare_path(str(ts))
+        if self.layout == "hive":
+            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
+            ident = f"date={dt:%Y-%m-%d}/hour={dt:%H}/{ts}"
+        else:
+            ident = str(ts)
+        return self.collection.new_bare_path(ident, timestamp=ts)
+
+    def _partitions(
+        self, start: int | None = None, end: int | None = None
+    ) -> list[Path]:
+        """Directories that may hold snapshots in `[start, end)`."""
+        path = self.collection.path
+        if self.layout == "flat":
+            return [path] if path.is_dir() else []
+        dirs = []
+        for d in path.glob("date=*/hour=*"):
+            try:
+                dt = datetime.strptime(
+                    f"{d.parent.name} {d.name}", "date=%Y-%m-%d hour=%H"
+                ).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            hour_start = int(dt.timestamp())
+            if (start is None or hour_start + 3600 > start) and (
+                end is None or hour_start < end
+            ):
+                dirs.append(d)
+        return sorted(dirs)
+
+    def _list(
+        self,
+        start: int | None,
+        end: int | None,
+        format: TabularFileFmt,
+    ) -> list[tuple[int, int, File]]:
+        """Find the snapshot and compacted files overlapping `[start, end)`,
+        as `(first, last, file)` tuples in chronological order.
+
+        Snapshots and compacted files already merged into a larger compacted
+        file are skipped, so that rows are never returned twice while a
+        compaction is in progress."""
+        snapshots: list[tuple[int, int, File]] = []
+        found: list[tuple[int, int, File]] = []
+        for d in self._partitions(start, end):
+            for fp in d.glob(f"*.{format}"):
+                first, sep, last = fp.stem.partition("-")
+                if not (first.isdigit() and (not sep or last.isdigit())):
+                    continue
+                item = (int(first), int(last) if sep else int(first), File(fp))
+                (found if sep else snapshots).append(item)
+        # a recompaction publishes `{first}-{last_new}` before deleting
+        # the `{first}-{last_old}` it supersedes
+        compacted = [
+            (a, b, fp)
+            for a, b, fp in found
+            if not any(
+                a2 <= a and b <= b2 and (a2, b2) != (a, b)
+                for a2, b2, _ in found
+            )
+        ]
+        items = compacted + [
+            (ts, ts, fp)
+            for ts, _, fp in snapshots
+            if not any(a <= ts <= b for a, b, _ in compacted)
+        ]
+        return sorted(
+            item
+            for item in items
+            if (start is None or item[1] >= start)
+            and (end is None or item[0] < end)
+        )
+
+    def files_in_range(
+        self,
+        start: IntoTimestamp | str,
+        end: IntoTimestamp | str,
+        *,
+        format: TabularFileFmt = "parquet",
+    ) -> list[File]:
+        """List the files holding snapshots in `[start, end)`, in
+        chronological order. With the `hive` layout, only the partitions
+        overlapping the range are listed.
+
+        This includes [compacted][fr24.cache.TimestampedCache.compact]
+        files, which may also hold snapshots outside of the range."""
+        start_ts, end_ts = to_unix_timestamp(start), to_unix_timestamp(end)
+        if start_ts == "now" or end_ts == "now":
+            raise ValueError("`now` is not allowed for cache ranges")
+        return [fp for _, _, fp in self._list(start_ts, end_ts, format)]
+
+    def _scan(self, files: list[File], format: TabularFileFmt) -> pl.LazyFrame:
+        """Lazily load snapshot and compacted files, adding the
+        `snapshot_ts` column to the former."""
+        import polars as pl
+
+        schema = profile_schema(self.schema, self.collection.profile)
+        snapshot_ts_dtype = pl.Datetime("ms", time_zone="UTC")
+        snapshots: list[Path] = [fp for fp in files if "-" not in fp.stem]
+        compacted: list[Path] = [fp for fp in files if "-" in fp.stem]
+        frames = []
+        if snapshots:
+            lf = _scan_files(
+                snapshots, format, schema, include_file_paths="_file"
+            )
+            ident = pl.col("_file").str.extract(r"(\d+)\.\w+$")
+            frames.append(
+                lf.with_columns(snapshot_ts=_snapshot_ts_column(ident)).drop(
+                    "_file"
+                )
+            )
+        if compacted:
+            frames.append(
+                pl.scan_parquet(
+                    compacted,
+                    schema={**schema, "snapshot_ts": snapshot_ts_dtype},
+                )
+            )
+        if not frames:
+            return pl.LazyFrame(
+                schema={**schema, "snapshot_ts": snapshot_ts_dtype}
+            )
+        return pl.concat(frames, how="vertical")
+
+    def scan_range(
+        self,
+        start: IntoTimestamp | str,
+        end: IntoTimestamp | str,
+        *,
+        format: TabularFileFmt = "parquet",
+    ) -> pl.LazyFrame:
+        """Lazily load all snapshots with timestamps in `[start, end)` as a
+        single frame, with an extra `snapshot_ts` column holding the
+        timestamp of the snapshot each row comes from.
+
+        :param start: A timestamp-like object, see
+            [fr24.utils.to_unix_timestamp][]. The `now` literal is not allowed.
+        :param end: Exclusive upper bound, same as `start`.
+        """
+        import polars as pl
+
+        start_ts, end_ts = to_unix_timestamp(start), to_unix_timestamp(end)
+        if start_ts == "now" or end_ts == "now":
+            raise ValueError("`now` is not allowed for cache ranges")
+        items = self._list(start_ts, end_ts, format)
+        lf = self._scan([fp for _, _, fp in items], format)
+        if any(first < start_ts or last >= end_ts for first, last, _ in items):
+            epoch = pl.col("snapshot_ts").dt.epoch("s")
+            lf = lf.filter((epoch >= start_ts) & (epoch < end_ts))
+        return lf
+
+    def compact(
+        self,
+        start: IntoTimestamp | str | None = None,
+        end: IntoTimestamp | str | None = None,
+        *,
+        min_files: int = 2,
+        row_group_size: int = 128 * 1024,
+    ) -> list[File]:
+        """Merge the parquet snapshots of each UTC hour into a single file
+        named `{first}-{last}.parquet`, sorted by flight id and timestamp,
+        with a `snapshot_ts` column.
+
+        The merged file is written to a temporary file and atomically
+        renamed before the snapshots are deleted. Readers going through
+        [scan_range][fr24.cache.TimestampedCache.scan_range] skip
+        snapshots covered by a merged file, so they never see duplicate or
+        partial data. The manifest is updated accordingly.
+
+        Returns the compacted files.
+
+        :param start: Only compact hours starting at or after this time.
+        :param end: Only compact hours ending at or before this time.
+            Defaults to the start of the current hour, so that files
+            still being recorded are left alone.
+        :param min_files: Skip hours with fewer files than this.
+        :param row_group_size: Number of rows in each parquet row group.
+        """
+        start_ts = None if start is None else to_unix_timestamp(start)
+        end_ts = (
+            int(time.time()) // 3600 * 3600
+            if end is None
+            else to_unix_timestamp(end)
+        )
+        if start_ts == "now" or end_ts == "now":
+            raise ValueError("`now` is not allowed for cache ranges")
+
+        hours = {
+            (first // 3600, fp.parent)
+            for first, _, fp in self._list(start_ts, end_ts, "parquet")
+        }
+        results = []
+        for hour, dir in sorted(hours):
+            if start_ts is not None and hour * 3600 < start_ts:
+                continue
+            if (hour + 1) * 3600 > end_ts:
+                continue
+            # serialise compactions of the same directory
+            with dir_lock(dir, ".compact.lock"):
+                dest = self._compact(
+                    dir,
+                    hour,
+                    min_files=min_files,
+                    row_group_size=row_group_size,
+                )
+            if dest is not None:
+                results.append(dest)
+        return results
+
+    def _compact(
+        self,
+        dir: Path,
+        hour: int,
+        *,
+        min_files: int = 2,
+        row_group_size: int = 128 * 1024,
+    ) -> File | None:
+        items = [
+            item
+            for item in self._list(hour * 3600, (hour + 1) * 3600, "parquet")
+            if item[2].parent == dir
+        ]
+        files = [fp for *_, fp in items]
+        if len(files) < min_files or all("-" in fp.stem for fp in files):
+            return None  # nothing new to merge
+        sort_by = [
+            c
+            for c in ("flightid", "flight_id", "timestamp")
+            if c in self.schema
+        ]
+        first, last = items[0][0], max(b for _, b, _ in items)
+        df = (
+            self._scan(files, "parquet")
+            .sort([*sort_by, "snapshot_ts"])
+            .collect()
+        )
+        dest = File(dir / f"{first}-{last}.parquet")
+        with atomic_write(dest) as tmp:
+            df.write_parquet(
+                tmp, row_group_size=row_group_size, statistics=True
+            )
+        self.collection.manifest.record(
+            self.collection,
+            dest,
+            "parquet",
+            df.height,
+            {"timestamp": first, "last_timestamp": last},
+        )
+        stale = [fp for fp in files if fp != dest]
+        for fp in stale:
+            fp.unlink(missing_ok=True)
+        self.collection.manifest.remove(*stale)
+        return dest
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        first, _, last = ident.partition("-")
+        if not first.isdigit() or not (last.isdigit() or not last):
+            return None
+        if last:
+            return {"timestamp": int(first), "last_timestamp": int(last)}
+        return {"timestamp": int(first)}
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return self.schema
+
+    def scan_all(self, *, format: TabularFileFmt = "parquet") -> pl.LazyFrame:
+        """Lazily load every snapshot of this collection as a single frame,
+        with an extra `snapshot_ts` column. Unlike other collections, files
+        are listed from the filesystem, see
+        [scan_range][fr24.cache.TimestampedCache.scan_range]."""
+        return self._scan(
+            [fp for *_, fp in self._list(None, None, format)], format
+        )
 
     def scan_table(
         self,
@@ -189,12 +729,27 @@ class TimestampedCache(GlobMixin):
     ) -> pl.LazyFrame:
         """Lazily load a timestamped file.
 
+        If the snapshot has been
+        [compacted][fr24.cache.TimestampedCache.compact], its rows are read
+        from the compacted file instead.
+
         :param timestamp: A timestamp-like object, see
             [fr24.utils.to_unix_timestamp][]. The `now` literal is not allowed.
         """
-        return scan_table(
-            self.get_path(timestamp), format=format, schema=self.schema
-        )
+        import polars as pl
+
+        path = self.get_path(timestamp)
+        if not format_bare_path(path, format).exists():
+            ts = to_unix_timestamp(timestamp)
+            assert isinstance(ts, int)  # validated by `get_path`
+            for _, _, fp in self._list(ts, ts + 1, "parquet"):
+                if "-" in fp.stem:
+                    return (
+                        self._scan([fp], "parquet")
+                        .filter(pl.col("snapshot_ts").dt.epoch("s") == ts)
+                        .drop("snapshot_ts")
+                    )
+        return scan_table(path, format=format, schema=self.schema)
 
 
 @dataclass_frozen
@@ -209,7 +764,26 @@ class NearestFlightsCache(GlobMixin):
         ts = to_unix_timestamp(timestamp)
         if ts is None or ts == "now":
             raise ValueError(f"invalid timestamp for cache: {timestamp}")
-        return self.collection.new_bare_path(f"{lon6}_{lat6}_{ts}")
+        return self.collection.new_bare_path(
+            f"{lon6}_{lat6}_{ts}", key=f"{lon6}_{lat6}", timestamp=ts
+        )
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        key, _, ts = ident.rpartition("_")
+        if not key or not ts.isdigit():
+            return None
+        return {"key": key, "timestamp": int(ts)}
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return nearest_flights_schema
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        parts = ident.str.split("_")
+        return {
+            "key": parts.list.slice(0, 2).list.join("_"),
+            "snapshot_ts": _snapshot_ts_column(parts.list.get(2)),
+        }
 
     def scan_table(
         self,
@@ -241,11 +815,31 @@ class FlightDetailsCache(GlobMixin):
     def get_path(
         self, flight_id: IntoFlightId, timestamp: IntoTimestamp | str
     ) -> BarePath:
-        fid = f"{to_flight_id(flight_id):0x}".upper()
+        fid = to_flight_id(flight_id)
         ts = to_unix_timestamp(timestamp)
         if ts is None or ts == "now":
             raise ValueError(f"invalid timestamp for cache: {timestamp}")
-        return self.collection.new_bare_path(f"{fid}_{ts}")
+        return self.collection.new_bare_path(
+            f"{fid:0x}".upper() + f"_{ts}", flight_id=fid, timestamp=ts
+        )
+
+    def parse_ident(self, ident: str) -> ManifestKeys | None:
+        fid, _, ts = ident.partition("_")
+        try:
+            return {"flight_id": int(fid, 16), "timestamp": int(ts)}
+        except ValueError:
+            return None
+
+    @property
+    def table_schema(self) -> dict[str, pl.DataType]:
+        return self.schema
+
+    def ident_columns(self, ident: pl.Expr) -> dict[str, pl.Expr]:
+        parts = ident.str.split("_")
+        return {
+            "flight_id": _flight_id_column(parts.list.get(0)),
+            "snapshot_ts": _snapshot_ts_column(parts.list.get(1)),
+        }
 
     def scan_table(
         self,
@@ -267,18 +861,415 @@ class FlightDetailsCache(GlobMixin):
         )
 
 
+DEFAULT_RESPONSE_TTL: dict[str, float | None] = {
+    "flight_list": 600,
+    "playback": None,
+    "live_feed": 5,
+    "live_feed_playback": None,
+    "airport_list": 600,
+    "find": 86400,
+    "nearest_flights": 5,
+    "live_flights_status": 5,
+    "top_flights": 30,
+    "flight_details": 5,
+    "playback_flight": None,
+}
+"""Default time-to-live (in seconds) of cached responses for each endpoint.
+`None` means the response never expires, e.g. for historic playback, see
+[fr24.cache.ResponseCache.get_ttl][]."""
+
+
+@dataclass_frozen
+class ResponseCache:
+    """Raw API responses, keyed by endpoint and request parameters.
+
+    Used by the services to serve repeated requests without hitting the
+    network, see [fr24.FR24][]. Responses are only served while they are
+    fresh according to `ttl`.
+    """
+
+    path: Path
+    ttl: Mapping[str, float | None] = field(
+        default_factory=lambda: dict(DEFAULT_RESPONSE_TTL)
+    )
+    """Time-to-live (in seconds) for each endpoint. Endpoints missing from
+    the mapping are not cached."""
+    settled_after: float = 86400
+    """Minimum age (in seconds) of the `timestamp` of a request for its
+    response to never expire. Younger requests, and those asking for `now`
+    or without a timestamp, use `unsettled_ttl` instead."""
+    unsettled_ttl: float = 5
+    """Time-to-live (in seconds) replacing `None` for requests that may
+    still return different data, e.g. the playback of a live flight."""
+
+    def get_ttl(self, endpoint: str, request: Any) -> float | None:
+        """Time-to-live of the response to `request`, `None` if it never
+        expires.
+
+        :raises KeyError: If the endpoint is not cached.
+        """
+        if (ttl := self.ttl[endpoint]) is not None:
+            return ttl
+        timestamp = to_unix_timestamp(getattr(request, "timestamp", None))
+        if (
+            isinstance(timestamp, int)
+            and timestamp <= time.time() - self.settled_after
+        ):
+            return None
+        return self.unsettled_ttl
+
+    def get_path(self, endpoint: str, request: Any) -> Path:
+        """:param request: The request parameters, hashed with
+        [fr24.archive.request_key][] so the path is the same across
+        interpreter runs."""
+        return self.path / endpoint / f"{request_key(request)}.bin"
+
+    def get(self, endpoint: str, request: Any) -> httpx.Response | None:
+        """Return the cached response, if present and fresh."""
+        if endpoint not in self.ttl:
+            return None
+        fp = self.get_path(endpoint, request)
+        try:
+            if (ttl := self.get_ttl(endpoint, request)) is not None and (
+                time.time() - fp.stat().st_mtime > ttl
+            ):
+                return None
+            data = fp.read_bytes()
+        except FileNotFoundError:
+            return None
+        meta, _, content = data.partition(b"\n")
+        return httpx.Response(
+            200, headers=orjson.loads(meta)["headers"], content=content
+        )
+
+    def put(
+        self, endpoint: str, request: Any, response: httpx.Response
+    ) -> None:
+        """Store a successful response."""
+        if (
+            endpoint not in self.ttl
+            or response.status_code != 200
+            or response.headers.get("grpc-status", "0") != "0"
+            or response.content[:1] in (b"", b"\x80")  # gRPC error trailers
+        ):
+            return
+        fp = self.get_path(endpoint, request)
+        # content is already decoded: drop headers describing the encoding
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k not in ("content-encoding", "content-length")
+        ]
+        meta = orjson.dumps({"headers": headers})
+        with atomic_write(fp) as tmp:
+            tmp.write_bytes(meta + b"\n" + response.content)
+
+
+class ManifestKeys(TypedDict, total=False):
+    """Fields identifying a file within its collection."""
+
+    key: str
+    flight_id: IntFlightId
+    timestamp: IntTimestampS
+    last_timestamp: IntTimestampS
+    """Last snapshot held by a [compacted][fr24.cache.TimestampedCache.compact]
+    file, whose `timestamp` is that of its first snapshot."""
+
+
+@dataclass_frozen
+class CacheLimits:
+    """Disk budget of a cache. Once exceeded, the oldest files are deleted
+    first, as recorded in the [manifest][fr24.cache.CacheManifest]."""
+
+    max_bytes: int | None = None
+    """Budget of all unpinned collections together."""
+    collection_max_bytes: Mapping[str, int] = field(default_factory=dict)
+    """Budget of individual collections, keyed by their path relative to
+    the cache directory, e.g. `feed` or `flight_list/reg`."""
+    pinned: frozenset[str] = frozenset({"playback", "playback_flight"})
+    """Collections that are never evicted. Defaults to the ones holding
+    historic data, which never changes once complete."""
+    check_every: int = 100
+    """Run the eviction after this many writes."""
+
+
+class CacheManifest:
+    """A SQLite index of the tabular files in a cache, maintained by
+    [fr24.utils.write_table][].
+
+    It records the collection, keys, row count, size and format of each
+    file, so that files can be listed and filtered without walking the
+    filesystem. Paths are stored relative to the cache directory.
+    """
+
+    def __init__(self, root: Path, limits: CacheLimits | None = None) -> None:
+        """
+        :param root: The cache directory. The manifest is created in it
+            on the first write.
+        :param limits: If set, files are evicted on write to keep the
+            cache within budget.
+        """
+        self.root = root
+        self.path = root / "manifest.sqlite"
+        self.limits = limits
+        self._db: sqlite3.Connection | None = None
+        self._num_writes = 0
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # wait for writers in other processes instead of failing
+            self._db = sqlite3.connect(self.path, timeout=60)
+            self._db.executescript(_MANIFEST_SCHEMA)
+            columns = {
+                name
+                for _, name, *_ in self._db.execute("PRAGMA table_info(files)")
+            }
+            if "last_timestamp" not in columns:  # created by an older version
+                with self._db as db:
+                    db.execute(
+                        "ALTER TABLE files ADD COLUMN last_timestamp INTEGER"
+                    )
+        return self._db
+
+    def collection_name(self, collection: Collection) -> str:
+        return collection.path.relative_to(self.root).as_posix()
+
+    def record(
+        self,
+        collection: Collection,
+        file: Path,
+        format: TabularFileFmt,
+        num_rows: int,
+        keys: ManifestKeys,
+    ) -> None:
+        """Add or replace the entry of a file."""
+        stat = file.stat()
+        with self.db as db:
+            db.execute(
+                "INSERT OR REPLACE INTO files (path, collection, key, "
+                "flight_id, timestamp, last_timestamp, format, num_rows, "
+                "size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file.relative_to(self.root).as_posix(),
+                    self.collection_name(collection),
+                    keys.get("key"),
+                    keys.get("flight_id"),
+                    keys.get("timestamp"),
+                    keys.get("last_timestamp"),
+                    format,
+                    num_rows,
+                    stat.st_size,
+                    stat.st_mtime,
+                ),
+            )
+        if self.limits is not None:
+            self._num_writes += 1
+            if self._num_writes >= self.limits.check_every:
+                self._num_writes = 0
+                self.evict(self.limits)
+
+    def query(
+        self,
+        collection: Collection,
+        *,
+        key: str | None = None,
+        flight_id: IntoFlightId | None = None,
+        start: IntoTimestamp | str | None = None,
+        end: IntoTimestamp | str | None = None,
+        format: TabularFileFmt | None = None,
+    ) -> list[File]:
+        """See [fr24.cache.GlobMixin.query][]."""
+        clauses = ["collection = ?"]
+        args: list[Any] = [self.collection_name(collection)]
+        if key is not None:
+            clauses.append("key = ?")
+            args.append(key.upper())
+        if flight_id is not None:
+            clauses.append("flight_id = ?")
+            args.append(to_flight_id(flight_id))
+        # compacted files overlapping the range are included
+        if start is not None:
+            clauses.append("COALESCE(last_timestamp, timestamp) >= ?")
+            args.append(to_unix_timestamp(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            args.append(to_unix_timestamp(end))
+        if format is not None:
+            clauses.append("format = ?")
+            args.append(format)
+        rows = self.db.execute(
+            f"SELECT path FROM files WHERE {' AND '.join(clauses)} "
+            "ORDER BY timestamp, path",
+            args,
+        )
+        return [File(self.root / path) for (path,) in rows]
+
+    def evict(self, limits: CacheLimits) -> list[Path]:
+        """Delete the oldest files until every budget in `limits` is met.
+
+        Only files recorded in the manifest are considered, see
+        [fr24.cache.FR24Cache.reindex][]. Returns the deleted files.
+        """
+        pinned = sorted(limits.pinned)
+        scopes: list[tuple[str, list[Any], int]] = [
+            ("collection = ?", [name], max_bytes)
+            for name, max_bytes in limits.collection_max_bytes.items()
+            if name not in limits.pinned
+        ]
+        if limits.max_bytes is not None:
+            scopes.append(
+                (
+                    f"collection NOT IN ({', '.join('?' * len(pinned))})",
+                    pinned,
+                    limits.max_bytes,
+                )
+            )
+        evicted: list[Path] = []
+        for where, args, max_bytes in scopes:
+            rows = self.db.execute(
+                "SELECT path FROM ("
+                "SELECT path, SUM(size) OVER ("
+                "ORDER BY mtime DESC, path DESC) AS total "
+                f"FROM files WHERE {where}"
+                ") WHERE total > ?",
+                [*args, max_bytes],
+            ).fetchall()
+            files = [self.root / path for (path,) in rows]
+            for file in files:
+                file.unlink(missing_ok=True)
+            self.remove(*files)
+            evicted.extend(files)
+        if evicted:
+            logger.info(f"evicted {len(evicted)} files from `{self.root}`")
+        return evicted
+
+    def remove(self, *files: Path) -> None:
+        """Remove the entries of deleted files."""
+        with self.db as db:
+            db.executemany(
+                "DELETE FROM files WHERE path = ?",
+                [(file.relative_to(self.root).as_posix(),) for file in files],
+            )
+
+    def clear(self) -> None:
+        with self.db as db:
+            db.execute("DELETE FROM files")
+
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    collection TEXT NOT NULL,
+    key TEXT,
+    flight_id INTEGER,
+    timestamp INTEGER,
+    format TEXT NOT NULL,
+    num_rows INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    last_timestamp INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_collection_timestamp
+    ON files(collection, timestamp);
+CREATE INDEX IF NOT EXISTS files_collection_key ON files(collection, key);
+CREATE INDEX IF NOT EXISTS files_collection_flight_id
+    ON files(collection, flight_id);
+"""
+
+
+class CrawlCheckpoint:
+    """Progress of a [flight list crawl][fr24.service.FlightListService.crawl],
+    so that an interrupted crawl resumes where it left off.
+
+    An ident is recorded once all of its pages have been written, so idents
+    that were in flight when the crawl stopped are fetched again.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """:param path: The SQLite file, created on the first write."""
+        self.path = Path(path)
+        self._db: sqlite3.Connection | None = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=60)
+            self._db.executescript(_CHECKPOINT_SCHEMA)
+        return self._db
+
+    def done(self, kind: Literal["reg", "flight"]) -> set[str]:
+        """Idents of this kind that were fully crawled."""
+        return {
+            ident
+            for (ident,) in self.db.execute(
+                "SELECT ident FROM crawled WHERE kind = ?", (kind,)
+            )
+        }
+
+    def record(
+        self,
+        kind: Literal["reg", "flight"],
+        ident: str,
+        num_pages: int,
+        num_rows: int,
+    ) -> None:
+        with self.db as db:
+            db.execute(
+                "INSERT OR REPLACE INTO crawled VALUES (?, ?, ?, ?, ?)",
+                (kind, ident, num_pages, num_rows, time.time()),
+            )
+
+    def clear(self) -> None:
+        """Forget all progress, e.g. to crawl again from scratch."""
+        with self.db as db:
+            db.execute("DELETE FROM crawled")
+
+
+_CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawled (
+    kind TEXT NOT NULL,
+    ident TEXT NOT NULL,
+    num_pages INTEGER NOT NULL,
+    num_rows INTEGER NOT NULL,
+    finished REAL NOT NULL,
+    PRIMARY KEY (kind, ident)
+);
+"""
+
+
 @dataclass_frozen
 class Collection:
     """A directory containing scannable files."""
 
     path: Path
+    manifest: CacheManifest = field(compare=False, repr=False)
+    profile: SchemaProfile = "default"
 
-    def new_bare_path(self, ident: str) -> BarePath:
-        """Returns the bare path (without the file extension) to the file."""
-        return BarePath(self.path / ident)
+    def new_bare_path(
+        self, ident: str, **keys: Unpack[ManifestKeys]
+    ) -> BarePath:
+        """Returns the bare path (without the file extension) to the file.
+
+        :param keys: See [fr24.cache.ManifestKeys][]. Recorded in the
+            manifest when a table is written to the path.
+        """
+        return BarePath(
+            self.path / ident,
+            profile=self.profile,
+            on_write=lambda file, format, num_rows: self.manifest.record(
+                self, file, format, num_rows, keys
+            ),
+        )
 
 
 class File(Path):
+    if sys.version_info < (3, 12):
+        # subclasses of `Path` must explicitly declare their flavour
+        _flavour = type(Path())._flavour  # type: ignore
+
     @property
     def format(self) -> TabularFileFmt:
         # TODO: perform validation, though it is not critical
@@ -287,3 +1278,11 @@ class File(Path):
     def scan_table(self) -> pl.LazyFrame:
         """Lazily load this file."""
         return scan_table(self, format=self.format)
+
+    def metadata(self) -> dict[str, Any] | None:
+        """Read the request parameters and server timestamp stored in this
+        file, from the footer only. See [fr24.utils.read_table_metadata][].
+        """
+        if self.format != "parquet":
+            return None
+        return read_table_metadata(self)
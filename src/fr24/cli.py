@@ -31,11 +31,11 @@ from rich.logging import RichHandler
 from typing_extensions import ParamSpec, TypeAlias
 
 from . import BBOX_FRANCE_UIR, FR24, BoundingBox, FR24Cache, service
-from .cache import PATH_CACHE
+from .cache import PATH_CACHE, CacheLimits
 from .configuration import FP_CONFIG_FILE, PATH_CONFIG
 from .service import LiveFeedPlaybackResult, LiveFeedResult, SupportsWriteTable
 from .types import IntFlightId, IntoFlightId, IntoTimestamp, IntTimestampS
-from .types.cache import TabularFileFmt
+from .types.cache import CacheLayout, TabularFileFmt
 from .types.grpc import LiveFeedField
 from .utils import (
     FileExistsBehaviour,
@@ -71,6 +71,26 @@ def tui() -> None:
     tui_main()
 
 
+@app.command()
+def calibrate_bbox(
+    target: Annotated[
+        int, typer.Option(help="Desired number of flights in each slice")
+    ] = 1000,
+) -> None:
+    """Learn longitude knots for each half-hour slot from the live feed
+    snapshots in the cache"""
+    from .static.bbox import (
+        FP_LNGS_WORLD_PER_HALF_HR,
+        calibrate_lngs_per_half_hr,
+        save_lngs_per_half_hr,
+    )
+
+    knots = calibrate_lngs_per_half_hr(
+        FR24Cache.default().live_feed, target=target
+    )
+    save_lngs_per_half_hr(knots, FP_LNGS_WORLD_PER_HALF_HR)
+
+
 app_auth = typer.Typer()
 app.add_typer(
     app_auth,
@@ -134,6 +154,112 @@ def create(
     )
 
 
+app_cache = typer.Typer()
+app.add_typer(
+    app_cache,
+    name="cache",
+    no_args_is_help=True,
+    help="Commands for managing the cache",
+)
+TIMESTAMPED_COLLECTIONS = ("live_feed", "live_flights_status", "top_flights")
+
+
+@app_cache.command()
+def compact(
+    collections: Annotated[
+        list[str],
+        typer.Option(
+            "--collection",
+            help="Collections to compact (default: all timestamped ones)",
+            click_type=click.Choice(TIMESTAMPED_COLLECTIONS),
+        ),
+    ] = list(TIMESTAMPED_COLLECTIONS),
+    layout: Annotated[
+        str,
+        typer.Option(
+            help="File layout of the cache",
+            click_type=click.Choice(get_args(CacheLayout)),
+        ),
+    ] = "flat",
+    start: Annotated[
+        Any,
+        typer.Option(
+            help="Only compact hours starting from this time",
+            click_type=TimestampSParser(allow_now=False),
+        ),
+    ] = None,
+    end: Annotated[
+        Any,
+        typer.Option(
+            help="Only compact hours before this time "
+            "(default: start of the current hour)",
+            click_type=TimestampSParser(allow_now=False),
+        ),
+    ] = None,
+    min_files: Annotated[
+        int, typer.Option(help="Skip hours with fewer files than this")
+    ] = 2,
+) -> None:
+    """Merge small timestamped snapshots into one sorted file per hour"""
+    cache = FR24Cache.default(layout=layout)  # type: ignore[arg-type]
+    for name in collections:
+        files = getattr(cache, name).compact(start, end, min_files=min_files)
+        stderr.print(f"{name}: compacted {len(files)} hour(s)")
+
+
+@app_cache.command()
+def gc(
+    max_size: Annotated[
+        Any,
+        typer.Option(
+            help="Budget of all unpinned collections together (e.g. `50G`)",
+            click_type=ByteSizeParser(),
+        ),
+    ] = None,
+    collection_max_size: Annotated[
+        list[str],
+        typer.Option(
+            help="Budget of a collection, as `name=size` "
+            "(e.g. `feed=10G`). Can be repeated.",
+        ),
+    ] = [],
+    pin: Annotated[
+        list[str],
+        typer.Option(help="Collections that are never evicted"),
+    ] = sorted(CacheLimits().pinned),
+    reindex: Annotated[
+        bool,
+        typer.Option(help="Index existing files before evicting"),
+    ] = False,
+) -> None:
+    """Delete the oldest cached files until the cache is within budget"""
+    parser = ByteSizeParser()
+    collection_max_bytes = {}
+    for item in collection_max_size:
+        name, sep, size = item.partition("=")
+        if not sep:
+            raise typer.BadParameter(
+                f"expected `name=size`, got {item!r}",
+                param_hint="--collection-max-size",
+            )
+        collection_max_bytes[name] = parser.convert(size, None, None)
+    if max_size is None and not collection_max_bytes:
+        raise typer.BadParameter(
+            "nothing to evict without a budget: "
+            "pass `--max-size` and/or `--collection-max-size`"
+        )
+    limits = CacheLimits(
+        max_bytes=max_size,
+        collection_max_bytes=collection_max_bytes,
+        pinned=frozenset(pin),
+    )
+    cache = FR24Cache.default()
+    if reindex:
+        cache.reindex()
+    files = cache.gc(limits)
+    stderr.print(f"evicted {len(files)} file(s)")
+
+
 def get_console(path: Path | IO[bytes] | None) -> Console:
     return Console(stderr=path is not None and not isinstance(path, Path))
 
@@ -294,7 +420,7 @@ def create_typer_signature(
     )
 
 
-class BoundingBoxParser(click.ParamType):
+class BoundingBoxParser(click.ParamType):  # type: ignore[type-arg]
     # weirdly, typer reads the `__name__` to show the type in the help message
     __name__ = name = "south,north,west,east"
 
@@ -317,7 +443,7 @@ class BoundingBoxParser(click.ParamType):
         return BoundingBox(*parts)
 
 
-class TimestampSParser(click.ParamType):
+class TimestampSParser(click.ParamType):  # type: ignore[type-arg]
     __name__ = name = "timestamp_s"
 
     def __init__(self, allow_now: bool) -> None:
@@ -343,7 +469,7 @@ class TimestampSParser(click.ParamType):
         return to_unix_timestamp(value)  # type: ignore
 
 
-class FlightIdParser(click.ParamType):
+class FlightIdParser(click.ParamType):  # type: ignore[type-arg]
     __name__ = name = "flight_id"
 
     def convert(
@@ -362,7 +488,33 @@ class FlightIdParser(click.ParamType):
             )
 
 
-class FilePathParser(click.ParamType):
+class ByteSizeParser(click.ParamType):  # type: ignore[type-arg]
+    __name__ = name = "size"
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None,
+    ) -> int:
+        if isinstance(value, int):
+            return value
+        text = str(value).strip().upper().removesuffix("B")
+        number = text.rstrip("KMGT")
+        unit = text[len(number) :]
+        try:
+            exponent = {"": 0, "K": 1, "M": 2, "G": 3, "T": 4}[unit]
+            return int(float(number) * 1024**exponent)
+        except (ValueError, KeyError):
+            self.fail(
+                f"could not convert {value!r} to a size in bytes "
+                "(e.g. `500M`, `10G`)",
+                param,
+                ctx,
+            )
+
+
+class FilePathParser(click.ParamType):  # type: ignore[type-arg]
     __name__ = name = "filepath|cache|-"
 
     def convert(
@@ -406,6 +558,15 @@ def get_typer_parameter_override(type_: type) -> TyperParamOverride:
             "kwargs": {"click_type": BoundingBoxParser()},
             "extra_help": f"Example (france UIR): `{example}`",
         }
+    if any(
+        get_origin(arg) is Sequence and BoundingBox in get_args(arg)
+        for arg in (type_, *type_args)
+    ):
+        return {
+            "hint": list[BoundingBox],
+            "kwargs": {"click_type": BoundingBoxParser()},
+            "extra_help": " Can be repeated.",
+        }
     if origin is set and LiveFeedField in type_args:
         return {
             "hint": list[str],
@@ -459,6 +620,21 @@ async def live_feed(fr24: FR24, *args: Any, **kwargs: Any) -> LiveFeedResult:
     return await fr24.live_feed.fetch(*args, **kwargs)
 
 
+@register_command(app, signature_from=service.LiveFeedService.fetch_world)
+async def live_feed_world(
+    fr24: FR24, *args: Any, **kwargs: Any
+) -> service.LiveFeedWorldResult:
+    if not kwargs.get("bounding_boxes"):
+        kwargs["bounding_boxes"] = None
+    result = await fr24.live_feed.fetch_world(*args, **kwargs)
+    for tile in result.tiles:
+        logger.info(
+            f"{tile.bounding_box}: {tile.num_flights} flights "
+            f"in {tile.elapsed:.2f}s"
+        )
+    return result
+
+
 @register_command(app, signature_from=service.LiveFeedPlaybackService.fetch)
 async def live_feed_playback(
     fr24: FR24, *args: Any, **kwargs: Any
@@ -22,13 +22,14 @@ Methods:
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, NamedTuple, Sequence, Union
+from typing import TYPE_CHECKING, Any, NamedTuple, Sequence, Union, cast
 
 import httpx
 from google.protobuf.field_mask_pb2 import FieldMask
 from google.protobuf.message import Message
 
 from .proto import (
+    FrameDecoder,
     ProtoError,
     SupportsToProto,
     encode_message,
@@ -83,6 +84,7 @@ if TYPE_CHECKING:
     from google.protobuf.internal.enum_type_wrapper import _V, _EnumTypeWrapper
     from typing_extensions import TypeAlias
 
+    from .proto import GrpcEncoding
     from .types import IntoFlightId, IntoTimestamp
     from .types.cache import (
         EMSRecord,
@@ -92,6 +94,7 @@ if TYPE_CHECKING:
         NearbyFlightRecord,
         PlaybackFlightRecord,
         RecentPositionRecord,
+        SchemaProfile,
         TopFlightRecord,
         TrailPointRecord,
     )
@@ -107,12 +110,16 @@ def construct_request(
     message: Message,
     headers: httpx.Headers,
 ) -> httpx.Request:
-    """Construct the gRPC request with encoded gRPC body."""
+    """Construct the gRPC request with encoded gRPC body.
+
+    The message is compressed if the headers specify a `grpc-encoding`.
+    """
+    encoding = cast("GrpcEncoding | None", headers.get("grpc-encoding"))
     return httpx.Request(
         "POST",
         f"https://data-feed.flightradar24.com/fr24.feed.api.v1.Feed/{method_name}",
         headers=headers,
-        content=encode_message(message),
+        content=encode_message(message, encoding),
     )
 
 
@@ -235,19 +242,89 @@ def live_feed_flightdata_dict(lfr: Flight) -> FlightRecord:
     }
 
 
-def live_feed_df(
-    data: LiveFeedResponse,
-) -> pl.DataFrame:
+def live_feed_flights_df(flights: Sequence[Flight]) -> pl.DataFrame:
+    """Convert a sequence of protobuf flights to a dataframe.
+
+    Unlike [fr24.grpc.live_feed_flightdata_dict][], this fills one typed
+    column at a time straight from the protobuf messages, and assembles the
+    position buffers from flat columns instead of a list of dicts per flight.
+    """
     import polars as pl
 
-    from .types.cache import live_feed_schema
+    from .types.cache import live_feed_schema, position_buffer_struct_schema
 
-    return pl.DataFrame(
-        (live_feed_flightdata_dict(lfr) for lfr in data.flights_list),
-        schema=live_feed_schema,
+    extra_infos = [lfr.extra_info for lfr in flights]
+    routes = [ei.route for ei in extra_infos]
+    recent_positions = [
+        lfr.position_buffer.recent_positions_list for lfr in flights
+    ]
+    recent_positions_flat = [rp for rps in recent_positions for rp in rps]
+
+    def column(name: str, values: list[Any]) -> pl.Series:
+        return pl.Series(name, values, dtype=live_feed_schema[name])
+
+    df = pl.DataFrame(
+        [
+            column("timestamp", [lfr.timestamp_ms for lfr in flights]),
+            column("flightid", [lfr.flightid for lfr in flights]),
+            column("latitude", [lfr.lat for lfr in flights]),
+            column("longitude", [lfr.lon for lfr in flights]),
+            column("track", [lfr.track for lfr in flights]),
+            column("altitude", [lfr.alt for lfr in flights]),
+            column("ground_speed", [lfr.speed for lfr in flights]),
+            column("on_ground", [lfr.on_ground for lfr in flights]),
+            column("callsign", [lfr.callsign for lfr in flights]),
+            column("source", [lfr.source for lfr in flights]),
+            column("registration", [ei.reg for ei in extra_infos]),
+            column("origin", [getattr(r, "from") for r in routes]),
+            column("destination", [r.to for r in routes]),
+            column("typecode", [ei.type for ei in extra_infos]),
+            column("eta", [ei.schedule.eta for ei in extra_infos]),
+            column("squawk", [ei.squawk for ei in extra_infos]),
+            column("vertical_speed", [ei.vspeed for ei in extra_infos]),
+        ]
+    )
+    # row index of the flight each recent position belongs to
+    pb_index = (
+        pl.int_range(len(flights), dtype=pl.UInt32, eager=True)
+        .repeat_by(pl.Series([len(rps) for rps in recent_positions]))
+        .explode()
+        .drop_nulls()
+    )
+    position_buffers = (
+        pl.DataFrame(
+            {
+                "index": pb_index,
+                "delta_lat": [rp.delta_lat for rp in recent_positions_flat],
+                "delta_lon": [rp.delta_lon for rp in recent_positions_flat],
+                "delta_ms": [rp.delta_ms for rp in recent_positions_flat],
+            },
+            schema={"index": pl.UInt32(), **position_buffer_struct_schema},
+        )
+        .group_by("index", maintain_order=True)
+        .agg(pl.struct(*position_buffer_struct_schema).alias("position_buffer"))
+    )
+    return (
+        df.with_row_index("index")
+        .join(position_buffers, on="index", how="left", maintain_order="left")
+        .drop("index")
+        .with_columns(
+            pl.col("position_buffer").fill_null(
+                pl.lit([], dtype=live_feed_schema["position_buffer"])
+            )
+        )
     )
 
 
+def live_feed_df(
+    data: LiveFeedResponse, *, profile: SchemaProfile = "default"
+) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
+    from .types.cache import with_profile
+
+    return with_profile(live_feed_flights_df(data.flights_list), profile)
+
+
 #
 # live feed playback
 #
@@ -315,18 +392,13 @@ async def live_feed_playback(
 
 
 def live_feed_playback_df(
-    data: PlaybackResponse,
+    data: PlaybackResponse, *, profile: SchemaProfile = "default"
 ) -> pl.DataFrame:
-    import polars as pl
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
+    from .types.cache import with_profile
 
-    from .types.cache import live_feed_schema
-
-    return pl.DataFrame(
-        (
-            live_feed_flightdata_dict(lfr)
-            for lfr in data.live_feed_response.flights_list
-        ),
-        schema=live_feed_schema,
+    return with_profile(
+        live_feed_flights_df(data.live_feed_response.flights_list), profile
     )
 
 
@@ -376,16 +448,23 @@ def nearest_flights_nearbyflight_dict(nf: NearbyFlight) -> NearbyFlightRecord:
 
 
 def nearest_flights_df(
-    data: NearestFlightsResponse,
+    data: NearestFlightsResponse, *, profile: SchemaProfile = "default"
 ) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
     import polars as pl
 
-    from .types.cache import nearest_flights_schema
+    from .types.cache import nearest_flights_schema, with_profile
 
-    return pl.DataFrame(
-        (nearest_flights_nearbyflight_dict(nf) for nf in data.flights_list),
-        schema=nearest_flights_schema,
+    df = live_feed_flights_df(
+        [nf.flight for nf in data.flights_list]
+    ).with_columns(
+        pl.Series(
+            "distance",
+            [nf.distance for nf in data.flights_list],
+            dtype=nearest_flights_schema["distance"],
+        )
     )
+    return with_profile(df, profile)
 
 
 @dataclass(**dataclass_opts)
@@ -423,18 +502,19 @@ def live_flights_status_flightstatusdata_dict(
 
 
 def live_flights_status_df(
-    data: LiveFlightsStatusResponse,
+    data: LiveFlightsStatusResponse, *, profile: SchemaProfile = "default"
 ) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
     import polars as pl
 
-    from .types.cache import live_flights_status_schema
+    from .types.cache import live_flights_status_schema, profile_schema
 
     return pl.DataFrame(
         (
             live_flights_status_flightstatusdata_dict(fs)
             for fs in data.flights_map
         ),
-        schema=live_flights_status_schema,
+        schema=profile_schema(live_flights_status_schema, profile),
     )
 
 
@@ -482,11 +562,23 @@ async def follow_flight_stream(
     message: IntoFollowFlightRequest,
     headers: httpx.Headers,
 ) -> AsyncGenerator[Annotated[bytes, ProtoError]]:
+    """
+    Stream the length-prefixed messages of a followed flight.
+
+    Each item is one complete message (or the trailers at the end of the
+    stream), regardless of how the body is chunked. Use
+    [fr24.proto.parse_data][] to decode it. Incomplete data left over when
+    the stream ends is yielded as-is, and fails to parse.
+    """
     request = construct_request("FollowFlight", to_proto(message), headers)
     response = await client.send(request, stream=True)
+    decoder = FrameDecoder()
     try:
         async for chunk in response.aiter_bytes():
-            yield chunk
+            for data in decoder.feed(chunk):
+                yield data
+        if pending := decoder.pending:
+            yield pending
     finally:
         await response.aclose()
 
@@ -531,14 +623,17 @@ def top_flights_dict(ff: FollowedFlight) -> TopFlightRecord:
     }
 
 
-def top_flights_df(data: TopFlightsResponse) -> pl.DataFrame:
+def top_flights_df(
+    data: TopFlightsResponse, *, profile: SchemaProfile = "default"
+) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
     import polars as pl
 
-    from .types.cache import top_flights_schema
+    from .types.cache import profile_schema, top_flights_schema
 
     return pl.DataFrame(
         (top_flights_dict(ff) for ff in data.scoreboard_list),
-        schema=top_flights_schema,
+        schema=profile_schema(top_flights_schema, profile),
     )
 
 
@@ -710,15 +805,16 @@ def ems_dict(ems: EMSInfo) -> EMSRecord:
 
 
 def flight_details_df(
-    data: FlightDetailsResponse,
+    data: FlightDetailsResponse, *, profile: SchemaProfile = "default"
 ) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
     import polars as pl
 
-    from .types.cache import flight_details_schema
+    from .types.cache import flight_details_schema, profile_schema
 
     return pl.DataFrame(
         [flight_details_dict(data)],
-        schema=flight_details_schema,
+        schema=profile_schema(flight_details_schema, profile),
     )
 
 
@@ -797,13 +893,14 @@ def playback_flight_dict(
 
 
 def playback_flight_df(
-    data: PlaybackFlightResponse,
+    data: PlaybackFlightResponse, *, profile: SchemaProfile = "default"
 ) -> pl.DataFrame:
+    """:param profile: See [fr24.types.cache.SchemaProfile][]."""
     import polars as pl
 
-    from .types.cache import playback_flight_schema
+    from .types.cache import playback_flight_schema, profile_schema
 
     return pl.DataFrame(
         [playback_flight_dict(data)],
-        schema=playback_flight_schema,
+        schema=profile_schema(playback_flight_schema, profile),
     )
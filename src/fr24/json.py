@@ -9,7 +9,13 @@ import httpx
 import orjson
 import polars as pl
 
-from .types.cache import flight_list_schema, playback_track_schema
+from .types.cache import (
+    flight_list_schema,
+    playback_track_ems_schema,
+    playback_track_schema,
+    profile_schema,
+    with_profile,
+)
 from .types.json import AirportList, Find, FlightList, Playback
 from .utils import (
     DEFAULT_HEADERS,
@@ -31,8 +37,10 @@ if TYPE_CHECKING:
     )
     from .types.cache import (
         FlightListRecord,
+        FrameT,
         PlaybackTrackEMSRecord,
         PlaybackTrackRecord,
+        SchemaProfile,
     )
     from .types.json import (
         AirportRequest,
@@ -431,23 +439,94 @@ def playback_track_ems_dict(point: TrackData) -> PlaybackTrackEMSRecord | None:
     return None
 
 
-def playback_df(data: Playback) -> pl.DataFrame:
+def playback_df(
+    data: Playback, *, profile: SchemaProfile = "default"
+) -> pl.DataFrame:
     """
     Parse each [fr24.types.json.TrackData][] in the API response into a
     dataframe.
 
     If the response is empty, a warning is logged and an empty table is returned
+
+    :param profile: See [fr24.types.cache.SchemaProfile][].
     """
     flight = data["result"]["response"]["data"]["flight"]
     if len(track := flight["track"]) == 0:
         logger.warning("no data in response, table will be empty")
-    return pl.DataFrame(
-        [playback_track_dict(point) for point in track],
-        schema=playback_track_schema,
+    return playback_track_df(track).cast(
+        profile_schema(playback_track_schema, profile)  # type: ignore[arg-type]
     )
     # NOTE: original implementation returns pl.DateTime instead of timestamp
 
 
+_EMS_KEYS = (
+    "ts",
+    "ias",
+    "tas",
+    "mach",
+    "mcp",
+    "fms",
+    "autopilot",
+    "oat",
+    "trueTrack",
+    "rollAngle",
+    "qnh",
+    "windDir",
+    "windSpd",
+    "precision",
+    "altGPS",
+    "emergencyStatus",
+    "tcasAcasDtatus",
+    "heading",
+)
+"""Keys of [fr24.types.json.EMS][], in the order of
+[fr24.types.cache.playback_track_ems_schema][]."""
+
+
+def playback_track_df(track: list[TrackData]) -> pl.DataFrame:
+    """Convert the track points of a playback to a dataframe.
+
+    Unlike [fr24.json.playback_track_dict][], this fills one typed column at
+    a time, parses the octal squawks in a single pass and assembles the EMS
+    struct from flat columns instead of a dict per point.
+    """
+    ems = [point["ems"] for point in track]
+    ems_present = [e for e in ems if e]
+    ems_structs = pl.DataFrame(
+        {
+            name: [e[key] for e in ems_present]  # type: ignore[literal-required]
+            for name, key in zip(playback_track_ems_schema, _EMS_KEYS)
+        },
+        schema=playback_track_ems_schema,
+    ).to_struct("ems")
+    # position of each point's EMS in `ems_structs`, null if it has none
+    has_ems = pl.Series([bool(e) for e in ems], dtype=pl.Boolean)
+    ems_index = pl.select(
+        pl.when(has_ems).then(has_ems.cast(pl.UInt32).cum_sum() - 1)
+    ).to_series()
+
+    def column(name: str, values: list[Any]) -> pl.Series:
+        return pl.Series(name, values, dtype=playback_track_schema[name])
+
+    return pl.DataFrame(
+        [
+            column("timestamp", [p["timestamp"] for p in track]),
+            column("latitude", [p["latitude"] for p in track]),
+            column("longitude", [p["longitude"] for p in track]),
+            column("altitude", [p["altitude"]["feet"] for p in track]),
+            column("ground_speed", [p["speed"]["kts"] for p in track]),
+            column(
+                "vertical_speed", [p["verticalSpeed"]["fpm"] for p in track]
+            ),
+            column("track", [p["heading"] for p in track]),
+            pl.Series("squawk", [p["squawk"] for p in track], dtype=pl.String)
+            .str.to_integer(base=8)
+            .cast(playback_track_schema["squawk"]),
+            ems_structs.gather(ems_index),
+        ]
+    )
+
+
 def flight_list_dict(entry: FlightListItem) -> FlightListRecord:
     """
     Flatten a flight entry into dict, converting fr24 hex ids into integers.
@@ -481,17 +560,95 @@ def flight_list_dict(entry: FlightListItem) -> FlightListRecord:
     }
 
 
-def flight_list_df(data: FlightList) -> pl.DataFrame:
+def flight_list_df(
+    data: FlightList, *, profile: SchemaProfile = "default"
+) -> pl.DataFrame:
     """
     Parse each [fr24.types.json.FlightListItem][] in the API response
     into a polars dataframe.
 
     If the response is empty, a warning is logged and an empty table is returned
+
+    :param profile: See [fr24.types.cache.SchemaProfile][].
     """
     if (flights := data["result"]["response"]["data"]) is None:
         logger.warning("no data in response, table will be empty")
-        return pl.DataFrame(schema=flight_list_schema)
+        flights = []
+    return with_profile(flight_list_items_df(flights), profile)
+
+
+def flight_list_items_df(flights: list[FlightListItem]) -> pl.DataFrame:
+    """Convert the flights of a flight list page to a dataframe.
+
+    Unlike [fr24.json.flight_list_dict][], this fills one typed column at a
+    time, and parses hex ids and converts timestamps a whole column at once.
+    """
+    idents = [f["identification"] for f in flights]
+    aircrafts = [f["aircraft"] for f in flights]
+    airports = [f["airport"] for f in flights]
+    times = [f["time"] for f in flights]
+
+    def column(name: str, values: list[Any]) -> pl.Series:
+        return pl.Series(name, values, dtype=flight_list_schema[name])
+
+    def hex_column(name: str, values: list[str | None]) -> pl.Series:
+        return (
+            pl.Series(name, values, dtype=pl.String)
+            .str.to_integer(base=16)
+            .cast(flight_list_schema[name])
+        )
+
+    def time_column(name: str, values: list[int | None]) -> pl.Series:
+        return (pl.Series(name, values, dtype=pl.Int64) * 1000).cast(
+            flight_list_schema[name]
+        )
+
     return pl.DataFrame(
-        [flight_list_dict(f) for f in flights],
-        schema=flight_list_schema,
+        [
+            hex_column("flight_id", [i["id"] for i in idents]),
+            column("number", [i["number"]["default"] for i in idents]),
+            column("callsign", [i["callsign"] for i in idents]),
+            hex_column("icao24", [a["hex"] for a in aircrafts]),
+            column("registration", [a["registration"] for a in aircrafts]),
+            column("typecode", [a["model"]["code"] for a in aircrafts]),
+            column(
+                "origin",
+                [
+                    o["code"]["icao"]
+                    if (o := a["origin"]) is not None
+                    else None
+                    for a in airports
+                ],
+            ),
+            column(
+                "destination",
+                [
+                    d["code"]["icao"]
+                    if (d := a["destination"]) is not None
+                    else None
+                    for a in airports
+                ],
+            ),
+            column("status", [f["status"]["text"] for f in flights]),
+            time_column("STOD", [t["scheduled"]["departure"] for t in times]),
+            time_column("ETOD", [t["estimated"]["departure"] for t in times]),
+            time_column("ATOD", [t["real"]["departure"] for t in times]),
+            time_column("STOA", [t["scheduled"]["arrival"] for t in times]),
+            time_column("ETOA", [t["estimated"]["arrival"] for t in times]),
+            time_column("ATOA", [t["real"]["arrival"] for t in times]),
+        ]
+    )
+
+
+def flight_list_unique(frame: FrameT) -> FrameT:
+    """Remove duplicate flights from merged flight list pages, keeping the
+    first occurrence.
+
+    Duplicates are identified by their (flight id, scheduled time of
+    departure). Future scheduled flights have no flight id, so the STOD is
+    the primary key. Flights without a STOD are always kept.
+    """
+    return frame.filter(
+        pl.struct("flight_id", "STOD").is_first_distinct()
+        | pl.col("STOD").is_null()
     )
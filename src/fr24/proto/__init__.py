@@ -4,13 +4,15 @@ For more information, see: https://github.com/grpc/grpc/blob/master/doc/PROTOCOL
 """
 
 from __future__ import annotations
-from typing import Type, TypeVar
+from typing import Literal, Type, TypeVar
+import gzip
 import struct
+import zlib
 
 from google.protobuf.message import Message
 from ..utils import Result, Ok, Err
 from typing import Union, Protocol
-from typing_extensions import runtime_checkable
+from typing_extensions import TypeAlias, runtime_checkable
 
 
 T_co = TypeVar("T_co", bound=Message, covariant=True)
@@ -34,26 +36,103 @@ def to_proto(message_like: SupportsToProto[T] | T) -> T:
     )
 
 
-def encode_message(msg: Message) -> bytes:
-    """Encode to a length-prefixed message."""
+GrpcEncoding: TypeAlias = Literal["gzip", "deflate", "zstd"]
+"""Message compression algorithms, as used in the `grpc-encoding` header."""
+
+
+def supported_encodings() -> list[GrpcEncoding]:
+    """Message compression algorithms available in this environment."""
+    encodings: list[GrpcEncoding] = ["gzip", "deflate"]
+    try:
+        import zstandard  # noqa: F401
+
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    return encodings
+
+
+def compress(data: bytes, encoding: GrpcEncoding) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data)
+    if encoding == "deflate":  # zlib format (RFC 1950)
+        return zlib.compress(data)
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def detect_encoding(data: bytes) -> GrpcEncoding | None:
+    """Guess the compression algorithm of a message from its magic bytes."""
+    if data[:2] == b"\x1f\x8b":
+        return "gzip"
+    if data[:4] == b"\x28\xb5\x2f\xfd":
+        return "zstd"
+    if (
+        len(data) >= 2
+        and data[0] & 0x0F == 8
+        and int.from_bytes(data[:2], "big") % 31 == 0
+    ):
+        return "deflate"
+    return None
+
+
+def decompress(data: bytes, encoding: GrpcEncoding | None = None) -> bytes:
+    """
+    Decompress a message.
+
+    :param encoding: Value of the `grpc-encoding` header.
+        If not given, it is guessed from the magic bytes of the message.
+    """
+    if encoding is None and (encoding := detect_encoding(data)) is None:
+        raise ValueError("unknown compression algorithm")
+    if encoding == "gzip":
+        return zlib.decompress(data, wbits=31)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    if encoding == "zstd":
+        import zstandard
+
+        # streaming decompressor: frames may not declare their content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def encode_message(msg: Message, encoding: GrpcEncoding | None = None) -> bytes:
+    """
+    Encode to a length-prefixed message.
+
+    :param encoding: Compress the message with this algorithm. The request
+        must also carry a matching `grpc-encoding` header.
+    """
     msg_bytes = msg.SerializeToString()
+    if encoding is not None:
+        msg_bytes = compress(msg_bytes, encoding)
     return (
-        b"\x00"  # u8, no compression
+        (b"\x00" if encoding is None else b"\x01")  # u8, compressed flag
         + struct.pack(
             ">I", len(msg_bytes)
-        )  # u64, length of message, big endian
+        )  # u32, length of message, big endian
         + msg_bytes  # binary octet
     )
 
 
-def parse_data(data: bytes, msg_type: Type[T]) -> Result[T, ProtoError]:
-    """Decode a DATA frame (optionally, with Trailers) into a protobuf message."""
+def parse_data(
+    data: bytes, msg_type: Type[T], encoding: GrpcEncoding | None = None
+) -> Result[T, ProtoError]:
+    """
+    Decode a DATA frame (optionally, with Trailers) into a protobuf message.
+
+    :param encoding: Value of the `grpc-encoding` response header, used if
+        the message is compressed. If not given, it is guessed from the
+        magic bytes of the message.
+    """
     if not data:
         return Err(GrpcError("empty DATA frame", data))
     compressed_flag = data[0]  # 1 byte unsigned int
-    if compressed_flag == 1:
-        return Err(GrpcError("message is compressed, not implemented", data))
-    if compressed_flag != 0:
+    if compressed_flag not in (0, 1):
         try:  # parse trailers
             return Err(GrpcError.from_trailers(data))
         except Exception:
@@ -66,12 +145,64 @@ def parse_data(data: bytes, msg_type: Type[T]) -> Result[T, ProtoError]:
     if not data_len:
         return Err(GrpcError("empty message payload", data))
     message = data[5 : 5 + data_len]  # message (in protobuf, binary octet)
+    if len(message) < data_len:
+        return Err(GrpcError("truncated message", data))
+    if compressed_flag == 1:
+        try:
+            message = decompress(message, encoding)
+        except Exception as e:
+            return Err(GrpcError(f"failed to decompress message: {e}", data))
     try:
         return Ok(msg_type.FromString(message))
     except Exception as e:
         return Err(ProtoParseError(f"failed to parse message: {e}", data))
 
 
+class FrameDecoder:
+    """
+    Incrementally split a byte stream into length-prefixed messages.
+
+    HTTP/2 may split a message across several chunks or coalesce several
+    messages into one, so chunks are accumulated in a buffer and only
+    complete messages (or trailers) are returned, each of which can be
+    passed to [fr24.proto.parse_data][].
+    """
+
+    __slots__ = ("_buffer", "_start")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._start = 0
+        """Offset of the first unconsumed byte in the buffer."""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Append a chunk and return the messages it completes."""
+        buffer = self._buffer
+        buffer += chunk
+        messages = []
+        with memoryview(buffer) as view:
+            while len(buffer) - self._start >= 5:
+                data_len = int.from_bytes(
+                    view[self._start + 1 : self._start + 5], byteorder="big"
+                )
+                end = self._start + 5 + data_len
+                if end > len(buffer):
+                    break
+                messages.append(bytes(view[self._start : end]))
+                self._start = end
+        # drop the consumed prefix only once it dominates the buffer, so the
+        # partial tail is copied O(1) times on average
+        if self._start and self._start * 2 >= len(buffer):
+            del buffer[: self._start]
+            self._start = 0
+        return messages
+
+    @property
+    def pending(self) -> bytes:
+        """Bytes of an incomplete message, if any."""
+        return bytes(self._buffer[self._start :])
+
+
 class GrpcError(Exception):
     """
     When an application or runtime error occurs during an RPC a
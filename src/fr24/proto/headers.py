@@ -4,6 +4,7 @@ import secrets
 from ..utils import DEFAULT_HEADERS
 
 from ..types.json import Authentication
+from . import GrpcEncoding, supported_encodings
 
 PLATFORM_VERSION = "25.197.0927"
 # see ./README.md.
@@ -21,8 +22,22 @@ DEFAULT_HEADERS_GRPC = {
     "DNT": "1",
 }
 
-def get_grpc_headers(*, auth: Authentication | None, device_id: None | str = None) -> dict[str, str]:
+def get_grpc_headers(
+    *,
+    auth: Authentication | None,
+    device_id: None | str = None,
+    encoding: GrpcEncoding | None = None,
+) -> dict[str, str]:
+    """
+    :param encoding: Compress request messages with this algorithm.
+        Compressed responses are always accepted.
+    """
     headers = DEFAULT_HEADERS_GRPC.copy()
+    headers["grpc-accept-encoding"] = ",".join(
+        ["identity", *supported_encodings()]
+    )
+    if encoding is not None:
+        headers["grpc-encoding"] = encoding
     if device_id is None:
         device_id = f"web-{secrets.token_urlsafe(32)}"
     headers["fr24-device-id"] = device_id
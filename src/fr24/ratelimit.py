@@ -0,0 +1,260 @@
+"""Client-side request pacing."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Mapping
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allow bursts of up to `capacity` requests, refilled at `rate` per
+    second.
+
+    ```py
+    bucket = TokenBucket(rate=2)
+    for _ in range(10):
+        await bucket.acquire()  # at most 2 requests per second
+        ...
+    ```
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        :param rate: Tokens added per second.
+        :param capacity: Maximum number of tokens. Defaults to
+            `max(1, rate)`, i.e. a burst of at most one second's worth.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # created on first use: before 3.10, it binds to the current loop
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available, then consume them.
+
+        Waiters are served in FIFO order.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if (deficit := tokens - self._tokens) > 0:
+                await asyncio.sleep(deficit / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+def backoff_delay(
+    attempt: int, base: float = 1.0, maximum: float = 60.0
+) -> float:
+    """Exponential backoff with jitter: a random delay in
+    `[d/2, d]`, where `d = min(maximum, base * 2**attempt)`."""
+    return min(maximum, base * 2.0**attempt) * random.uniform(0.5, 1.0)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """A token bucket that slows down when the server throttles us and
+    speeds back up while requests succeed (AIMD).
+
+    On each throttled response, the rate is halved and new requests are
+    held back for an exponentially growing, jittered delay. On each
+    successful response, the rate grows by a fraction of the initial rate,
+    up to `max_rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        max_rate: float | None = None,
+        min_rate: float | None = None,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        """
+        :param rate: Initial tokens added per second.
+        :param max_rate: Upper bound when speeding up. Defaults to `rate`.
+        :param min_rate: Lower bound when slowing down. Defaults to
+            `rate / 16`.
+        :param backoff_base: Delay (in seconds) after the first throttled
+            response.
+        :param backoff_max: Upper bound of the delay.
+        """
+        super().__init__(rate, capacity)
+        self.max_rate = rate if max_rate is None else max_rate
+        self.min_rate = rate / 16 if min_rate is None else min_rate
+        self.increase = rate / 20
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.num_throttled = 0
+        """Number of consecutive throttled responses."""
+        self._blocked_until = 0.0
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        while (wait := self._blocked_until - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+        await super().acquire(tokens)
+
+    def on_success(self) -> None:
+        self.num_throttled = 0
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """:param retry_after: Minimum delay requested by the server."""
+        delay = backoff_delay(
+            self.num_throttled, self.backoff_base, self.backoff_max
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.num_throttled += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        logger.warning(
+            f"throttled, backing off for {delay:.1f}s (rate: {self.rate:.2f}/s)"
+        )
+
+
+THROTTLE_STATUS_CODES = frozenset({429, 464, 503})
+"""HTTP status codes signalling that we are sending too many requests.
+`464` is sent by the load balancer in front of the API."""
+THROTTLE_GRPC_STATUSES = frozenset({"8", "14"})
+"""`RESOURCE_EXHAUSTED` and `UNAVAILABLE`."""
+
+DEFAULT_HOST_LIMITS: dict[str, tuple[float, float]] = {
+    "data-feed.flightradar24.com": (10.0, 40.0),
+    "api.flightradar24.com": (1.0, 4.0),
+    "www.flightradar24.com": (1.0, 4.0),
+}
+"""Initial and maximum requests per second for each host."""
+
+
+class RateLimiter:
+    """Per-host [fr24.ratelimit.AdaptiveTokenBucket][]s, applied to every
+    request of an `httpx.AsyncClient` by wrapping its transport:
+
+    ```py
+    ratelimiter = RateLimiter()
+    client = httpx.AsyncClient(
+        http2=True,
+        transport=ratelimiter.transport(httpx.AsyncHTTPTransport(http2=True)),
+    )
+    ```
+
+    Requests throttled by the server are resent once the bucket's backoff
+    delay has elapsed. Requests to hosts without a configured limit are
+    neither paced nor retried.
+    """
+
+    def __init__(
+        self,
+        host_limits: Mapping[str, tuple[float, float]] | None = None,
+        *,
+        max_retries: int = 3,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param host_limits: Initial and maximum requests per second for
+            each host. Defaults to [fr24.ratelimit.DEFAULT_HOST_LIMITS][].
+        :param max_retries: Number of times a throttled request is resent
+            before its throttled response is returned to the caller.
+        :param kwargs: Passed to each [fr24.ratelimit.AdaptiveTokenBucket][].
+        """
+        if host_limits is None:
+            host_limits = DEFAULT_HOST_LIMITS
+        self.max_retries = max_retries
+        self.buckets = {
+            host: AdaptiveTokenBucket(rate, max_rate=max_rate, **kwargs)
+            for host, (rate, max_rate) in host_limits.items()
+        }
+
+    def transport(
+        self, transport: httpx.AsyncBaseTransport
+    ) -> RateLimitedTransport:
+        """Wrap `transport` to pace and retry the requests sent through it."""
+        return self._wrap(transport)
+
+    def install(self, client: httpx.AsyncClient) -> None:
+        """Pace all requests sent by an existing `client`. Idempotent.
+
+        This replaces private attributes of the client: prefer creating the
+        client with [transport][fr24.ratelimit.RateLimiter.transport].
+        """
+        client._transport = self._wrap(client._transport)
+        client._mounts = {
+            pattern: None if transport is None else self._wrap(transport)
+            for pattern, transport in client._mounts.items()
+        }
+
+    def _wrap(
+        self, transport: httpx.AsyncBaseTransport
+    ) -> RateLimitedTransport:
+        if (
+            isinstance(transport, RateLimitedTransport)
+            and transport.ratelimiter is self
+        ):
+            return transport
+        return RateLimitedTransport(transport, self)
+
+
+def is_throttled(response: httpx.Response) -> bool:
+    return (
+        response.status_code in THROTTLE_STATUS_CODES
+        or response.headers.get("grpc-status") in THROTTLE_GRPC_STATUSES
+    )
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport to pace its requests with a
+    [fr24.ratelimit.RateLimiter][] and resend throttled ones."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, ratelimiter: RateLimiter
+    ) -> None:
+        self.transport = transport
+        self.ratelimiter = ratelimiter
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if (bucket := self.ratelimiter.buckets.get(request.url.host)) is None:
+            return await self.transport.handle_async_request(request)
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            response = await self.transport.handle_async_request(request)
+            if not is_throttled(response):
+                bucket.on_success()
+                return response
+            retry_after = response.headers.get("retry-after")
+            bucket.on_throttle(
+                float(retry_after)
+                if retry_after is not None and retry_after.isdigit()
+                else None
+            )
+            if attempt >= self.ratelimiter.max_retries:
+                return response
+            attempt += 1
+            await response.aclose()
+            logger.info(f"retrying throttled request {request.url}")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
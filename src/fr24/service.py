@@ -2,24 +2,35 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass, field, fields, replace
+from email.utils import formatdate
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
     AsyncIterator,
+    Awaitable,
+    Callable,
     Generic,
+    Iterable,
+    Iterator,
     Literal,
     Protocol,
     Sequence,
     TypeVar,
     Union,
+    cast,
 )
 
+import httpx
 from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import Message
 from typing_extensions import runtime_checkable
 
-from .cache import FR24Cache
+from .archive import ResponseArchive
+from .cache import CrawlCheckpoint, FR24Cache, ResponseCache
 from .grpc import (
     BoundingBox,
     FlightDetailsParams,
@@ -58,12 +69,13 @@ from .json import (
     flight_list,
     flight_list_df,
     flight_list_parse,
+    flight_list_unique,
     playback,
     playback_df,
     playback_metadata_dict,
     playback_parse,
 )
-from .proto import SupportsToProto, parse_data
+from .proto import GrpcEncoding, SupportsToProto, parse_data
 from .proto.v1_pb2 import (
     FlightDetailsResponse,
     FollowFlightResponse,
@@ -75,7 +87,14 @@ from .proto.v1_pb2 import (
     RestrictionVisibility,
     TopFlightsResponse,
 )
-from .types import IntoFlightId, IntoTimestamp, IntTimestampS
+from .ratelimit import TokenBucket, backoff_delay
+from .static.bbox import AdaptiveTiler
+from .types import (
+    IntoFlightId,
+    IntoTimestamp,
+    IntTimestampMs,
+    IntTimestampS,
+)
 from .types.cache import TabularFileFmt
 from .types.grpc import LiveFeedField
 from .types.json import (
@@ -86,20 +105,25 @@ from .types.json import (
     Playback,
 )
 from .utils import (
+    Err,
     FileExistsBehaviour,
     FileLike,
+    Ok,
+    Result,
     SupportsToDict,
     SupportsToPolars,
+    UnwrapError,
     dataclass_frozen,
     dataclass_opts,
     get_current_timestamp,
     parse_server_timestamp,
+    sink_table,
     static_check_signature,
+    to_flight_id,
     write_table,
 )
 
 if TYPE_CHECKING:
-    import httpx
     import polars as pl
     from typing_extensions import TypeAlias
 
@@ -115,6 +139,47 @@ logger = logging.getLogger(__name__)
 @dataclass_frozen
 class ServiceFactory:
     http: HTTPClient
+    response_cache: ResponseCache | None = None
+    """If set, serve fresh responses from this cache instead of the
+    network."""
+    archive: ResponseArchive | None = None
+    """If set, archive the body of every successful response fetched from
+    the network."""
+
+    async def send(
+        self,
+        endpoint: str,
+        request: Any,
+        send: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Send a request, reading through the response cache if enabled.
+
+        :param endpoint: Name of the endpoint, used as the key for the
+            time-to-live policy of [fr24.cache.ResponseCache][].
+        :param request: The request parameters.
+        :param send: Sends the request on a cache miss.
+        """
+        if self.response_cache is not None and (
+            (response := self.response_cache.get(endpoint, request)) is not None
+        ):
+            logger.debug(f"serving {endpoint} from cache")
+            return response
+        response = await send()
+        if self.response_cache is not None:
+            self.response_cache.put(endpoint, request, response)
+        if self.archive is not None and response.status_code == 200:
+            timestamp = (
+                parse_server_timestamp(response) or get_current_timestamp()
+            )
+            # compression and the index write would block the event loop
+            await asyncio.to_thread(
+                self.archive.put,
+                endpoint,
+                request,
+                response.content,
+                timestamp,
+            )
+        return response
 
     def build_flight_list(self) -> FlightListService:
         return FlightListService(self)
@@ -155,6 +220,9 @@ class ServiceFactory:
 
 RequestT = TypeVar("RequestT")
 """Arguments for the request"""
+T = TypeVar("T")
+MessageT = TypeVar("MessageT", bound=Message)
+APIResultT = TypeVar("APIResultT", bound="APIResult[Any]")
 
 
 @runtime_checkable
@@ -163,6 +231,78 @@ class SupportsFetch(Protocol[RequestT]):
         """Fetches data from the API."""
         ...
 
+    async def fetch_many(
+        self,
+        params: Iterable[RequestT],
+        *,
+        concurrency: int = 4,
+        rate: float | None = None,
+        slim: bool = False,
+    ) -> AsyncIterator[Result[APIResult[RequestT], FetchError[RequestT]]]:
+        """Fetch many requests concurrently.
+
+        Results are yielded in completion order, not in the order of
+        `params`. A failed request yields an `Err` instead of aborting the
+        batch. `params` is consumed lazily, so it may be a long generator.
+
+        :param params: Request parameters, e.g. [fr24.json.PlaybackParams][]
+            for [fr24.service.PlaybackService][].
+        :param concurrency: Maximum number of requests in flight.
+        :param rate: Maximum number of requests started per second.
+        :param slim: Yield [slim][fr24.service.APIResult.slim] results, so
+            that memory does not grow with the number of raw responses held
+            by the caller. A response that cannot be parsed yields an `Err`.
+        """
+        bucket = TokenBucket(rate) if rate is not None else None
+
+        async def fetch_one(
+            request: RequestT,
+        ) -> Result[APIResult[RequestT], FetchError[RequestT]]:
+            if bucket is not None:
+                await bucket.acquire()
+            kwargs = {
+                f.name: getattr(request, f.name)
+                for f in fields(request)  # type: ignore[arg-type]
+            }
+            try:
+                result = await self.fetch(**kwargs)
+                return Ok(result.slim() if slim else result)
+            except Exception as e:
+                return Err(FetchError(request, e))
+
+        requests = iter(params)
+        pending: set[asyncio.Task[Any]] = set()
+
+        def spawn() -> None:
+            for request in requests:
+                pending.add(asyncio.create_task(fetch_one(request)))
+                return
+
+        for _ in range(concurrency):
+            spawn()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for _ in done:  # refill before handing results back
+                    spawn()
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class FetchError(Exception, Generic[RequestT]):
+    """A request of [fr24.service.SupportsFetch.fetch_many][] failed."""
+
+    def __init__(self, request: RequestT, error: Exception) -> None:
+        super().__init__(f"{request}: {error!r}")
+        self.request = request
+        self.error = error
+
 
 @dataclass_frozen
 class APIResult(Generic[RequestT]):
@@ -175,6 +315,80 @@ class APIResult(Generic[RequestT]):
 
     request: RequestT
     response: httpx.Response
+    _parsed: dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Representations of the response, computed once by
+    [_memoize][fr24.service.APIResult._memoize]."""
+
+    def _memoize(self, key: str, parse: Callable[[], T]) -> T:
+        """Return the cached result of `parse`, calling it on first use.
+
+        Conversions (`to_proto`, `to_dict`, `to_polars`) are memoized, so
+        converting the same result several times (e.g. to a table, then to
+        the cache) parses the response once. The returned objects are shared
+        between calls: copy them before mutating.
+        """
+        try:
+            return self._parsed[key]  # type: ignore[no-any-return]
+        except KeyError:
+            value = self._parsed[key] = parse()
+            return value
+
+    def _parse_grpc(self, msg_type: type[MessageT]) -> MessageT:
+        """Decode the gRPC message in the body, decompressing it according
+        to the `grpc-encoding` header of the response."""
+        encoding = self.response.headers.get("grpc-encoding")
+        return parse_data(
+            self.response.content,
+            msg_type,
+            cast("GrpcEncoding | None", encoding),
+        ).unwrap()
+
+    def slim(self: APIResultT) -> APIResultT:
+        """Parse the response eagerly, then return a copy that keeps the
+        parsed table (or dict, for non-tabular results), the request and the
+        server timestamp, but not the raw body and headers.
+
+        `to_polars`, `write_table` and `table_metadata` work as before, but
+        `to_proto` and `to_dict` of tabular results are no longer available.
+        Use it to keep memory flat when holding on to many results:
+
+        ```py
+        async for r in fr24.playback.fetch_many(params, slim=True):
+            results.append(r.unwrap())
+        ```
+        """
+        keep: tuple[str, ...] = ()
+        if isinstance(self, SupportsToPolars):
+            self.to_polars()
+            self.table_metadata()  # memoizes the flight metadata of playbacks
+            keep = ("polars", "metadata")
+        elif isinstance(self, SupportsToDict):
+            self.to_dict()
+            keep = ("dict",)
+        response = self.response
+        date = response.headers.get("date")
+        slim = replace(
+            self,
+            response=httpx.Response(
+                response.status_code,
+                headers={"date": date} if date is not None else None,
+            ),
+        )
+        slim._parsed.update(
+            (k, v) for k, v in self._parsed.items() if k in keep
+        )
+        return slim
+
+    def table_metadata(self) -> dict[str, Any]:
+        """Context stored alongside the table when writing to parquet, see
+        [fr24.utils.read_table_metadata][]."""
+        timestamp = getattr(self, "timestamp", None)
+        return {
+            "request": self.request,
+            "timestamp": timestamp or parse_server_timestamp(self.response),
+        }
 
 
 WriteLocation: TypeAlias = Union[FileLike, FR24Cache]
@@ -223,11 +437,15 @@ class FlightListService(SupportsFetch[FlightListParams]):
         params = FlightListParams(
             reg=reg, flight=flight, page=page, limit=limit, timestamp=timestamp
         )
-        response = await flight_list(
-            self._factory.http.client,
+        response = await self._factory.send(
+            "flight_list",
             params,
-            self._factory.http.json_headers,
-            self._factory.http.auth,
+            lambda: flight_list(
+                self._factory.http.client,
+                params,
+                self._factory.http.json_headers,
+                self._factory.http.auth,
+            ),
         )
         return FlightListResult(
             request=params,
@@ -238,8 +456,9 @@ class FlightListService(SupportsFetch[FlightListParams]):
     class FetchAllArgs(FlightListParams):
         """Arguments for fetching all pages of the flight list."""
 
-        delay: int = field(default=5)
-        """Delay between requests in seconds."""
+        delay: int | None = field(default=None)
+        """Additional delay between requests in seconds. Requests are
+        already paced by the client's rate limiter."""
         max_pages: int | None = field(default=None)
         """Maximum number of pages to fetch."""
 
@@ -251,7 +470,7 @@ class FlightListService(SupportsFetch[FlightListParams]):
         page: int = 1,
         limit: int = 10,
         timestamp: IntoTimestamp | Literal["now"] | None = "now",
-        delay: int = 5,
+        delay: int | None = None,
         max_pages: int | None = None,
     ) -> AsyncIterator[FlightListResult]:
         """Fetch all pages of the flight list.
@@ -261,7 +480,8 @@ class FlightListService(SupportsFetch[FlightListParams]):
         :param page: Page number
         :param limit: Number of results per page - use `100` if authenticated.
         :param timestamp: Show flights with ATD before this Unix timestamp
-        :param delay: Delay between requests in seconds.
+        :param delay: Additional delay between requests in seconds.
+            Requests are already paced by the client's rate limiter.
         :param max_pages: Maximum number of pages to fetch.
         """
         # TODO: something nasty with async generators is happening here
@@ -296,7 +516,155 @@ class FlightListService(SupportsFetch[FlightListParams]):
             )
 
             more = response_dict["result"]["response"]["page"]["more"]
-            await asyncio.sleep(delay)
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def sink_all(
+        self,
+        file: WriteLocation,
+        *,
+        reg: str | None = None,
+        flight: str | None = None,
+        limit: int = 10,
+        timestamp: IntoTimestamp | Literal["now"] | None = "now",
+        delay: int | None = None,
+        max_pages: int | None = None,
+        format: TabularFileFmt = "parquet",
+        when_file_exists: FileExistsBehaviour = "backup",
+        on_page: Callable[[FlightListResult], None] | None = None,
+    ) -> int:
+        """Fetch all pages of the flight list and stream them into a single
+        deduplicated table, without holding the pages in memory.
+
+        Each page is spilled to a temporary parquet file as it arrives. The
+        pages are then merged lazily and sunk to `file`. Returns the number
+        of rows written.
+
+        :param file: Destination, or a cache to write to its flight list
+            collection.
+        :param on_page: Called with each page once it is spilled.
+        See [fetch_all][fr24.service.FlightListService.fetch_all] for the
+        other parameters.
+        """
+        import tempfile
+
+        import polars as pl
+
+        from .types.cache import flight_list_schema
+
+        if isinstance(file, FR24Cache):
+            params = FlightListParams(reg=reg, flight=flight)
+            file = file.flight_list(params.kind).get_path(params.ident)
+        with tempfile.TemporaryDirectory(prefix="fr24-") as tmp:
+            parts: list[Path] = []
+            async for result in self.fetch_all(
+                reg=reg,
+                flight=flight,
+                limit=limit,
+                timestamp=timestamp,
+                delay=delay,
+                max_pages=max_pages,
+            ):
+                part = Path(tmp) / f"{len(parts):05d}.parquet"
+                result.to_polars().write_parquet(part)
+                parts.append(part)
+                if on_page is not None:
+                    on_page(result)
+            lf = (
+                pl.scan_parquet(parts, schema=flight_list_schema)
+                if parts
+                else pl.LazyFrame(schema=flight_list_schema)
+            )
+            return sink_table(
+                flight_list_unique(lf),
+                file,
+                format=format,
+                when_file_exists=when_file_exists,
+            )
+
+    async def crawl(
+        self,
+        idents: Iterable[str],
+        cache: FR24Cache,
+        *,
+        kind: Literal["reg", "flight"] = "reg",
+        concurrency: int = 4,
+        limit: int = 10,
+        timestamp: IntoTimestamp | Literal["now"] | None = "now",
+        max_pages: int | None = None,
+        checkpoint: CrawlCheckpoint | None = None,
+        format: TabularFileFmt = "parquet",
+    ) -> FlightListCrawlStats:
+        """Fetch the full flight history of many registrations or flight
+        numbers, writing each one to the cache as soon as it completes.
+
+        Paginations of different idents run concurrently, while all requests
+        share the client's [rate limiter][fr24.ratelimit.RateLimiter]. Each
+        completed ident is recorded in `checkpoint`, so calling this again
+        with the same idents resumes an interrupted crawl. A failed ident is
+        logged and left out of the checkpoint, to be retried on the next run.
+
+        ```py
+        stats = await fr24.flight_list.crawl(["B-HPB", "B-LRA"], cache)
+        print(f"{stats.rows_per_second:.1f} rows/s")
+        ```
+
+        :param idents: Registrations (e.g. `B-HUJ`) or flight numbers (e.g.
+            `CX8747`), depending on `kind`.
+        :param concurrency: Maximum number of paginations in flight.
+        :param checkpoint: Defaults to `flight_list/crawl.sqlite` in the
+            cache directory.
+        See [fetch_all][fr24.service.FlightListService.fetch_all] for the
+        other parameters.
+        """
+        if checkpoint is None:
+            checkpoint = CrawlCheckpoint(
+                cache.path / "flight_list" / "crawl.sqlite"
+            )
+        done = checkpoint.done(kind)
+        todo = [ident for ident in dict.fromkeys(idents) if ident not in done]
+        stats = FlightListCrawlStats(
+            num_idents=len(todo), num_skipped=len(done)
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def crawl_one(ident: str) -> None:
+            num_pages = 0
+
+            def on_page(result: FlightListResult) -> None:
+                nonlocal num_pages
+                num_pages += 1
+                stats.num_pages += 1
+                stats.num_rows += result.to_polars().height
+
+            async with semaphore:
+                try:
+                    num_rows = await self.sink_all(
+                        cache,
+                        reg=ident if kind == "reg" else None,
+                        flight=ident if kind == "flight" else None,
+                        limit=limit,
+                        timestamp=timestamp,
+                        max_pages=max_pages,
+                        format=format,
+                        when_file_exists="overwrite",
+                        on_page=on_page,
+                    )
+                except Exception as e:
+                    stats.failed[ident] = e
+                    logger.warning(f"failed to crawl {kind} {ident}: {e!r}")
+                    return
+            checkpoint.record(kind, ident, num_pages, num_rows)
+            stats.num_done += 1
+            logger.info(
+                f"{kind} {ident}: {num_rows} rows in {num_pages} pages "
+                f"({stats.num_done}/{stats.num_idents} done, "
+                f"{stats.pages_per_second:.2f} pages/s, "
+                f"{stats.rows_per_second:.1f} rows/s)"
+            )
+
+        await asyncio.gather(*(crawl_one(ident) for ident in todo))
+        return stats
 
     def new_result_collection(self) -> FlightListResultCollection:
         """Create an empty list of flight list API results.
@@ -317,10 +685,12 @@ class FlightListResult(
     """A single result from the flight list API."""
 
     def to_dict(self) -> FlightList:
-        return flight_list_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: flight_list_parse(self.response).unwrap()
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return flight_list_df(self.to_dict())
+        return self._memoize("polars", lambda: flight_list_df(self.to_dict()))
 
     def write_table(
         self,
@@ -358,7 +728,6 @@ class FlightListResultCollection(
             return FLIGHT_LIST_EMPTY
 
         ident_hashes: set[int] = set()
-        data = self[0].to_dict()
         flights_all = []
         for result in self:
             if (
@@ -386,11 +755,31 @@ class FlightListResultCollection(
                 ident_hashes.add(ident_hash)
                 flights_all.append(flight)
 
-        data["result"]["response"]["data"] = flights_all
-        return data
+        # the parsed pages are memoized: copy the path to the flights
+        # instead of overwriting them in the first page
+        first = self[0].to_dict()
+        return cast(
+            FlightList,
+            {
+                **first,
+                "result": {
+                    **first["result"],
+                    "response": {
+                        **first["result"]["response"],
+                        "data": flights_all,
+                    },
+                },
+            },
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return flight_list_df(self.to_dict())
+        """Concatenate the table of each page, removing duplicates as in
+        [to_dict][fr24.service.FlightListResultCollection.to_dict]."""
+        import polars as pl
+
+        if not self:
+            return flight_list_df(FLIGHT_LIST_EMPTY)
+        return flight_list_unique(pl.concat(r.to_polars() for r in self))
 
     def write_table(
         self,
@@ -413,6 +802,36 @@ class FlightListResultCollection(
         )
 
 
+@dataclass(**dataclass_opts)
+class FlightListCrawlStats:
+    """Progress and throughput of a
+    [crawl][fr24.service.FlightListService.crawl]."""
+
+    num_idents: int = 0
+    """Number of idents to crawl, excluding those already done."""
+    num_skipped: int = 0
+    """Number of idents already done according to the checkpoint."""
+    num_done: int = 0
+    num_pages: int = 0
+    num_rows: int = 0
+    """Number of rows fetched, before removing duplicates across pages."""
+    failed: dict[str, Exception] = field(default_factory=dict)
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the crawl started."""
+        return time.monotonic() - self.started
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.num_pages / max(self.elapsed, 1e-9)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.num_rows / max(self.elapsed, 1e-9)
+
+
 @dataclass_frozen
 class PlaybackService(SupportsFetch[PlaybackParams]):
     """Playback service."""
@@ -431,11 +850,15 @@ class PlaybackService(SupportsFetch[PlaybackParams]):
             Optional, but it is recommended to include it.
         """
         params = PlaybackParams(flight_id, timestamp)
-        response = await playback(
-            self._factory.http.client,
+        response = await self._factory.send(
+            "playback",
             params,
-            self._factory.http.json_headers,
-            self._factory.http.auth,
+            lambda: playback(
+                self._factory.http.client,
+                params,
+                self._factory.http.json_headers,
+                self._factory.http.auth,
+            ),
         )
         return PlaybackResult(
             request=params,
@@ -451,17 +874,25 @@ class PlaybackResult(
     SupportsWriteTable,
 ):
     def to_dict(self) -> Playback:
-        return playback_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: playback_parse(self.response).unwrap()
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return playback_df(self.to_dict())
+        return self._memoize("polars", lambda: playback_df(self.to_dict()))
 
     def metadata(self) -> dict[str, Any]:
         """Extracts flight metadata from the response."""
-        return playback_metadata_dict(
-            self.to_dict()["result"]["response"]["data"]["flight"]
+        return self._memoize(
+            "metadata",
+            lambda: playback_metadata_dict(
+                self.to_dict()["result"]["response"]["data"]["flight"]
+            ),
         )
 
+    def table_metadata(self) -> dict[str, Any]:
+        return {**APIResult.table_metadata(self), "metadata": self.metadata()}
+
     def write_table(
         self,
         file: WriteLocation,
@@ -511,10 +942,14 @@ class LiveFeedService(SupportsFetch[LiveFeedParams]):
             maxage=maxage,
             fields=fields,
         )
-        response = await live_feed(
-            self._factory.http.client,
-            params.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "live_feed",
+            params,
+            lambda: live_feed(
+                self._factory.http.client,
+                params.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         # NOTE: serverTimeMs in the protobuf response would be more accurate
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
@@ -524,6 +959,110 @@ class LiveFeedService(SupportsFetch[LiveFeedParams]):
             timestamp=timestamp,
         )
 
+    async def fetch_world(
+        self,
+        bounding_boxes: Sequence[BoundingBox] | AdaptiveTiler | None = None,
+        stats: bool = False,
+        limit: int = 1500,
+        maxage: int = 14400,
+        fields: set[LiveFeedField] = (
+            lambda: {"flight", "reg", "route", "type"}
+        )(),  # type: ignore
+        concurrency: int = 8,
+    ) -> LiveFeedWorldResult:
+        """Fetch a snapshot of the live feed over many bounding boxes at once.
+
+        All tiles are requested concurrently over the shared HTTP/2 client.
+        Tiles returning `limit` flights are likely truncated: they are split
+        into quadrants and refetched. Flights appearing in more than one tile
+        are deduplicated when the snapshot is converted to a table.
+
+        :param bounding_boxes: Tiles to fetch. Defaults to the static tiles
+            `fr24.BBOXES_WORLD_STATIC`, which cover the entire world.
+            If an `fr24.static.bbox.AdaptiveTiler` is given, the tiles are
+            taken from and learned by the tiler across calls.
+        :param stats: Whether to include stats in the given area.
+        :param limit: Maximum number of flights per tile (should be set to 1500
+            for unauthorized users, 2000 for authorized users).
+        :param maxage: Maximum time since last message update, seconds.
+        :param fields: Fields to include. For unauthenticated users,
+        a maximum of 4 fields can be included.
+        When authenticated, `squawk`, `vspeed`, `airspace`, `logo_id` and `age`
+        can be included.
+        :param concurrency: Maximum number of tiles requested at the same time.
+        """
+        if bounding_boxes is None:
+            from . import BBOXES_WORLD_STATIC
+
+            bounding_boxes = BBOXES_WORLD_STATIC
+        timestamp = get_current_timestamp()
+        if isinstance(bounding_boxes, AdaptiveTiler):
+            tiler = bounding_boxes
+            pending = tiler.tiles(timestamp)
+        else:
+            tiler = None
+            pending = list(bounding_boxes)
+        splitter = tiler or AdaptiveTiler()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_tile(
+            bounding_box: BoundingBox,
+        ) -> Result[LiveFeedTile, FetchError[LiveFeedParams]]:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await self.fetch(
+                        bounding_box,
+                        stats=stats,
+                        limit=limit,
+                        maxage=maxage,
+                        fields=fields,
+                    )
+                except Exception as e:
+                    return Err(
+                        FetchError(LiveFeedParams(bounding_box=bounding_box), e)
+                    )
+                elapsed = time.perf_counter() - start
+            try:
+                proto = result.to_proto()
+            except UnwrapError as e:
+                return Err(FetchError(result.request, e.err.err()))
+            return Ok(
+                LiveFeedTile(
+                    result=result,
+                    elapsed=elapsed,
+                    num_flights=len(proto.flights_list),
+                )
+            )
+
+        tiles: list[LiveFeedTile] = []
+        failed: list[FetchError[LiveFeedParams]] = []
+        while pending:
+            fetched = await asyncio.gather(*(fetch_tile(b) for b in pending))
+            pending = []
+            for tile_result in fetched:
+                if (error := tile_result.err()) is not None:
+                    logger.warning(f"failed to fetch tile: {error}")
+                    failed.append(error)
+                    continue
+                tile = tile_result.unwrap()
+                if tile.num_flights >= limit and (
+                    children := splitter.split(tile.bounding_box)
+                ):
+                    logger.info(
+                        f"tile {tile.bounding_box} is saturated, splitting"
+                    )
+                    pending.extend(children)
+                else:
+                    tiles.append(tile)
+        if tiler is not None:
+            tiler.update(
+                timestamp,
+                ((tile.bounding_box, tile.num_flights) for tile in tiles),
+                limit,
+            )
+        return LiveFeedWorldResult(tiles=tiles, failed=failed)
+
 
 @dataclass_frozen
 class LiveFeedResult(
@@ -536,13 +1075,118 @@ class LiveFeedResult(
     timestamp: IntTimestampS
 
     def to_proto(self) -> LiveFeedResponse:
-        return parse_data(self.response.content, LiveFeedResponse).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(LiveFeedResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
+
+    def to_polars(self) -> pl.DataFrame:
+        return self._memoize("polars", lambda: live_feed_df(self.to_proto()))
+
+    def write_table(
+        self,
+        file: WriteLocation,
+        *,
+        format: TabularFileFmt = "parquet",
+        when_file_exists: FileExistsBehaviour = "backup",
+    ) -> None:
+        if isinstance(file, FR24Cache):
+            file = file.live_feed.get_path(self.timestamp)
+        write_table(
+            self, file, format=format, when_file_exists=when_file_exists
+        )
+
+
+@dataclass_frozen
+class LiveFeedTile:
+    """A single tile of a [world snapshot][fr24.service.LiveFeedWorldResult]."""
+
+    result: LiveFeedResult
+    elapsed: float
+    """Wall time spent waiting for this tile, in seconds."""
+    num_flights: int
+    """Number of flights returned for this tile."""
+
+    @property
+    def bounding_box(self) -> BoundingBox:
+        return self.result.request.bounding_box
+
+
+@dataclass_frozen
+class LiveFeedWorldResult(
+    SupportsToPolars,
+    SupportsWriteTable,
+):
+    """Live feed results for a set of tiles fetched together."""
+
+    tiles: list[LiveFeedTile]
+    """Tiles that were fetched and parsed successfully."""
+    failed: list[FetchError[LiveFeedParams]] = field(default_factory=list)
+    """Tiles that could not be fetched or parsed. They are excluded from
+    [to_polars][fr24.service.LiveFeedWorldResult.to_polars]."""
+
+    @property
+    def timestamp(self) -> IntTimestampS:
+        """Earliest server timestamp among all tiles.
+
+        :raises ValueError: If no tile was fetched successfully.
+        """
+        if not self.tiles:
+            raise ValueError(
+                f"no timestamp: all {len(self.failed)} tiles failed to fetch"
+            )
+        return min(tile.result.timestamp for tile in self.tiles)
 
     def to_polars(self) -> pl.DataFrame:
-        return live_feed_df(self.to_proto())
+        """Merge all tiles into a single table.
+
+        Flights present in overlapping tiles are deduplicated by their
+        `flightid`, keeping the most recent observation.
+        """
+        import polars as pl
+
+        from .types.cache import live_feed_schema
+
+        if not self.tiles:
+            return pl.DataFrame(schema=live_feed_schema)
+        return (
+            pl.concat(tile.result.to_polars() for tile in self.tiles)
+            .filter(
+                pl.col("timestamp")
+                == pl.col("timestamp").max().over("flightid")
+            )
+            .unique("flightid", keep="first", maintain_order=True)
+        )
+
+    def tile_stats(self) -> pl.DataFrame:
+        """Number of flights and time elapsed for each tile."""
+        import polars as pl
+
+        return pl.DataFrame(
+            [
+                {
+                    **tile.bounding_box._asdict(),
+                    "num_flights": tile.num_flights,
+                    "elapsed": tile.elapsed,
+                }
+                for tile in self.tiles
+            ],
+            schema={
+                "south": pl.Float32(),
+                "north": pl.Float32(),
+                "west": pl.Float32(),
+                "east": pl.Float32(),
+                "num_flights": pl.UInt32(),
+                "elapsed": pl.Float64(),
+            },
+        )
 
     def write_table(
         self,
@@ -604,10 +1248,14 @@ class LiveFeedPlaybackService(SupportsFetch[LiveFeedPlaybackParams]):
             duration=duration,
             hfreq=hfreq,
         )
-        response = await live_feed_playback(
-            self._factory.http.client,
-            params.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "live_feed_playback",
+            params,
+            lambda: live_feed_playback(
+                self._factory.http.client,
+                params.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         return LiveFeedPlaybackResult(
             request=params,
@@ -624,13 +1272,22 @@ class LiveFeedPlaybackResult(
     SupportsWriteTable,
 ):
     def to_proto(self) -> PlaybackResponse:
-        return parse_data(self.response.content, PlaybackResponse).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(PlaybackResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return live_feed_playback_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: live_feed_playback_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -676,11 +1333,15 @@ class AirportListService(SupportsFetch[AirportListParams]):
             limit=limit,
             timestamp=timestamp,
         )
-        response = await airport_list(
-            self._factory.http.client,
+        response = await self._factory.send(
+            "airport_list",
             params,
-            self._factory.http.json_headers,
-            self._factory.http.auth,
+            lambda: airport_list(
+                self._factory.http.client,
+                params,
+                self._factory.http.json_headers,
+                self._factory.http.auth,
+            ),
         )
         return AirportListResult(
             request=params,
@@ -695,7 +1356,9 @@ class AirportListResult(
 ):
     def to_dict(self) -> AirportList:
         """Parse the response into a dictionary."""
-        return airport_list_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: airport_list_parse(self.response).unwrap()
+        )
 
 
 @dataclass_frozen
@@ -711,11 +1374,15 @@ class FindService(SupportsFetch[FindParams]):
         :param query: Airport, schedule (HKG-CDG), or aircraft.
         """
         params = FindParams(query=query, limit=limit)
-        response = await find(
-            self._factory.http.client,
+        response = await self._factory.send(
+            "find",
             params,
-            self._factory.http.json_headers,
-            self._factory.http.auth,
+            lambda: find(
+                self._factory.http.client,
+                params,
+                self._factory.http.json_headers,
+                self._factory.http.auth,
+            ),
         )
         return FindResult(
             request=params,
@@ -732,7 +1399,7 @@ class FindResult(
 
     def to_dict(self) -> Find:
         """Parse the response into a dictionary."""
-        return find_parse(self.response).unwrap()
+        return self._memoize("dict", lambda: find_parse(self.response).unwrap())
 
 
 @dataclass_frozen
@@ -758,10 +1425,14 @@ class NearestFlightsService(SupportsFetch[NearestFlightsParams]):
             radius=radius,
             limit=limit,
         )
-        response = await nearest_flights(
-            self._factory.http.client,
-            request.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "nearest_flights",
+            request,
+            lambda: nearest_flights(
+                self._factory.http.client,
+                request.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return NearestFlightsResult(
@@ -782,15 +1453,22 @@ class NearestFlightsResult(
     timestamp: IntTimestampS
 
     def to_proto(self) -> NearestFlightsResponse:
-        return parse_data(
-            self.response.content, NearestFlightsResponse
-        ).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(NearestFlightsResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return nearest_flights_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: nearest_flights_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -823,10 +1501,14 @@ class LiveFlightsStatusService(SupportsFetch[LiveFlightsStatusParams]):
         :param flight_ids: List of flight IDs to get status for
         """
         request = LiveFlightsStatusParams(flight_ids=flight_ids)
-        response = await live_flights_status(
-            self._factory.http.client,
-            request.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "live_flights_status",
+            request,
+            lambda: live_flights_status(
+                self._factory.http.client,
+                request.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return LiveFlightsStatusResult(
@@ -847,15 +1529,22 @@ class LiveFlightsStatusResult(
     timestamp: IntTimestampS
 
     def to_proto(self) -> LiveFlightsStatusResponse:
-        return parse_data(
-            self.response.content, LiveFlightsStatusResponse
-        ).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(LiveFlightsStatusResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return live_flights_status_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: live_flights_status_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -905,6 +1594,19 @@ class FollowFlightService:
                 response=response,
             )
 
+    def follow_many(
+        self,
+        flight_ids: Iterable[IntoFlightId] = (),
+        **kwargs: Any,
+    ) -> FollowFlightMultiplexer:
+        """Follow many flights at once, with automatic reconnection.
+
+        :param flight_ids: Flights to follow from the start. More can be
+            added or removed later.
+        :param kwargs: See [fr24.service.FollowFlightMultiplexer][].
+        """
+        return FollowFlightMultiplexer(self, flight_ids, **kwargs)
+
 
 @dataclass_frozen
 class FollowFlightResult(
@@ -921,6 +1623,175 @@ class FollowFlightResult(
         return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
 
 
+@dataclass(**dataclass_opts)
+class FollowFlightStats:
+    """Metrics of one stream of a [fr24.service.FollowFlightMultiplexer][]."""
+
+    num_messages: int = 0
+    num_errors: int = 0
+    """Number of error frames, undecodable messages and dropped connections."""
+    num_reconnects: int = 0
+    last_received: float | None = None
+    """Wall clock time (in seconds) when the last message was received."""
+    last_timestamp: IntTimestampMs | None = None
+    """Timestamp of the last position reported by the server."""
+    last_error: Exception | None = None
+
+    @property
+    def lag(self) -> float | None:
+        """Seconds between the last position and its arrival."""
+        if self.last_received is None or not self.last_timestamp:
+            return None
+        return self.last_received - self.last_timestamp / 1000
+
+    @property
+    def idle(self) -> float | None:
+        """Seconds since the last message was received."""
+        if self.last_received is None:
+            return None
+        return time.time() - self.last_received
+
+
+class FollowFlightMultiplexer:
+    """Follow a dynamic set of flights, merging their updates into one
+    async iterator.
+
+    Each flight is followed by its own task over the shared HTTP client, so
+    with HTTP/2 all streams are multiplexed over the same connection.
+    Streams that end or fail are reconnected with exponential backoff and
+    jitter. Iteration stops once no flights are being followed.
+
+    ```py
+    async with fr24.follow_flight.follow_many([0x395C43CF]) as mux:
+        async for result in mux:
+            print(result.request.flight_id, result.to_proto().flight_info)
+    ```
+    """
+
+    def __init__(
+        self,
+        service: FollowFlightService,
+        flight_ids: Iterable[IntoFlightId] = (),
+        *,
+        restriction_mode: RestrictionVisibility.ValueType
+        | str
+        | bytes = RestrictionVisibility.NOT_VISIBLE,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_retries: int | None = 10,
+        max_queue_size: int = 0,
+    ) -> None:
+        """
+        :param flight_ids: Flights to follow from the start.
+        :param backoff_base: Delay (in seconds) before the first reconnect.
+        :param backoff_max: Upper bound of the reconnect delay.
+        :param max_retries: Stop following a flight after this many
+            consecutive reconnects without receiving a message, e.g. when
+            it is no longer live. `None` retries forever.
+        :param max_queue_size: Maximum number of buffered updates. Streams
+            pause when the consumer falls behind. `0` means unbounded.
+        """
+        self._service = service
+        self.restriction_mode = restriction_mode
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+        self._queue: asyncio.Queue[FollowFlightResult | None] = asyncio.Queue(
+            max_queue_size
+        )
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self.stats: dict[int, FollowFlightStats] = {}
+        """Metrics of each followed flight, keyed by flight ID."""
+        self._initial = [to_flight_id(fid) for fid in flight_ids]
+
+    @property
+    def flight_ids(self) -> set[int]:
+        """Flights currently being followed."""
+        return set(self._tasks)
+
+    def add(self, flight_id: IntoFlightId) -> None:
+        """Start following a flight. No-op if it is already followed."""
+        fid = to_flight_id(flight_id)
+        if fid in self._tasks:
+            return
+        self.stats.setdefault(fid, FollowFlightStats())
+        task = asyncio.create_task(self._follow(fid))
+        task.add_done_callback(lambda _: self._on_done(fid, task))
+        self._tasks[fid] = task
+
+    def remove(self, flight_id: IntoFlightId) -> None:
+        """Stop following a flight. No-op if it is not followed."""
+        if (task := self._tasks.get(to_flight_id(flight_id))) is not None:
+            task.cancel()
+
+    def _on_done(self, flight_id: int, task: asyncio.Task[None]) -> None:
+        if self._tasks.get(flight_id) is task:
+            del self._tasks[flight_id]
+        if not task.cancelled() and (e := task.exception()) is not None:
+            logger.error(f"stream for {flight_id:x} crashed: {e!r}")
+        if not self._tasks and self._queue.empty():
+            self._queue.put_nowait(None)  # wake up the consumer
+
+    async def _follow(self, flight_id: int) -> None:
+        stats = self.stats[flight_id]
+        retries = 0
+        while True:
+            try:
+                async for result in self._service.stream(
+                    flight_id, self.restriction_mode
+                ):
+                    proto = parse_data(result.response, FollowFlightResponse)
+                    if (e := proto.err()) is not None:
+                        stats.num_errors += 1
+                        stats.last_error = e
+                        continue
+                    retries = 0
+                    stats.num_messages += 1
+                    stats.last_received = time.time()
+                    flight_info = proto.unwrap().flight_info
+                    if timestamp := flight_info.timestamp_ms:
+                        stats.last_timestamp = timestamp
+                    await self._queue.put(result)
+            except httpx.TransportError as e:
+                stats.num_errors += 1
+                stats.last_error = e
+            if self.max_retries is not None and retries >= self.max_retries:
+                logger.warning(
+                    f"giving up on {flight_id:x} after {retries} retries: "
+                    f"{stats.last_error!r}"
+                )
+                return
+            delay = backoff_delay(retries, self.backoff_base, self.backoff_max)
+            logger.info(f"reconnecting to {flight_id:x} in {delay:.1f}s")
+            retries += 1
+            stats.num_reconnects += 1
+            await asyncio.sleep(delay)
+
+    def __aiter__(self) -> FollowFlightMultiplexer:
+        return self
+
+    async def __anext__(self) -> FollowFlightResult:
+        while self._tasks or not self._queue.empty():
+            if (result := await self._queue.get()) is not None:
+                return result
+        raise StopAsyncIteration
+
+    async def __aenter__(self) -> FollowFlightMultiplexer:
+        for fid in self._initial:
+            self.add(fid)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop following all flights."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @dataclass_frozen
 class TopFlightsService(SupportsFetch[TopFlightsParams]):
     """Top flights service."""
@@ -934,10 +1805,14 @@ class TopFlightsService(SupportsFetch[TopFlightsParams]):
         :param limit: Maximum number of top flights to return (1-10)
         """
         request = TopFlightsParams(limit=limit)
-        response = await top_flights(
-            self._factory.http.client,
-            request.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "top_flights",
+            request,
+            lambda: top_flights(
+                self._factory.http.client,
+                request.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return TopFlightsResult(
@@ -958,13 +1833,20 @@ class TopFlightsResult(
     timestamp: IntTimestampS
 
     def to_proto(self) -> TopFlightsResponse:
-        return parse_data(self.response.content, TopFlightsResponse).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(TopFlightsResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return top_flights_df(self.to_proto())
+        return self._memoize("polars", lambda: top_flights_df(self.to_proto()))
 
     def write_table(
         self,
@@ -1011,10 +1893,14 @@ class FlightDetailsService(SupportsFetch[FlightDetailsParams]):
             restriction_mode=restriction_mode,
             verbose=verbose,
         )
-        response = await flight_details(
-            self._factory.http.client,
-            request.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "flight_details",
+            request,
+            lambda: flight_details(
+                self._factory.http.client,
+                request.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return FlightDetailsResult(
@@ -1035,13 +1921,22 @@ class FlightDetailsResult(
     timestamp: IntTimestampS
 
     def to_proto(self) -> FlightDetailsResponse:
-        return parse_data(self.response.content, FlightDetailsResponse).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(FlightDetailsResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return flight_details_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: flight_details_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -1079,10 +1974,14 @@ class PlaybackFlightService(SupportsFetch[PlaybackFlightParams]):
             flight_id=flight_id,
             timestamp=timestamp,
         )
-        response = await playback_flight(
-            self._factory.http.client,
-            request.to_proto(),
-            self._factory.http.grpc_headers,
+        response = await self._factory.send(
+            "playback_flight",
+            request,
+            lambda: playback_flight(
+                self._factory.http.client,
+                request.to_proto(),
+                self._factory.http.grpc_headers,
+            ),
         )
         return PlaybackFlightResult(
             request=request,
@@ -1099,15 +1998,22 @@ class PlaybackFlightResult(
     SupportsWriteTable,
 ):
     def to_proto(self) -> PlaybackFlightResponse:
-        return parse_data(
-            self.response.content, PlaybackFlightResponse
-        ).unwrap()
+        return self._memoize(
+            "proto", lambda: self._parse_grpc(PlaybackFlightResponse)
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return playback_flight_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: playback_flight_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -1123,3 +2029,93 @@ class PlaybackFlightResult(
         write_table(
             self, file, format=format, when_file_exists=when_file_exists
         )
+
+
+ENDPOINT_RESULTS: dict[str, type[APIResult[Any]]] = {
+    "flight_list": FlightListResult,
+    "playback": PlaybackResult,
+    "live_feed": LiveFeedResult,
+    "live_feed_playback": LiveFeedPlaybackResult,
+    "airport_list": AirportListResult,
+    "find": FindResult,
+    "nearest_flights": NearestFlightsResult,
+    "live_flights_status": LiveFlightsStatusResult,
+    "top_flights": TopFlightsResult,
+    "flight_details": FlightDetailsResult,
+    "playback_flight": PlaybackFlightResult,
+}
+"""Result type of each endpoint, as named in
+[fr24.archive.ResponseArchive][]."""
+
+ENDPOINT_PARAMS: dict[str, type[Any]] = {
+    "flight_list": FlightListParams,
+    "playback": PlaybackParams,
+    "live_feed": LiveFeedParams,
+    "live_feed_playback": LiveFeedPlaybackParams,
+    "airport_list": AirportListParams,
+    "find": FindParams,
+    "nearest_flights": NearestFlightsParams,
+    "live_flights_status": LiveFlightsStatusParams,
+    "top_flights": TopFlightsParams,
+    "flight_details": FlightDetailsParams,
+    "playback_flight": PlaybackFlightParams,
+}
+"""Request parameters of each endpoint, as named in
+[fr24.archive.ResponseArchive][]."""
+
+
+def _request_from_json(params_type: type[RequestT], data: Any) -> RequestT:
+    """Rebuild request parameters from their
+    [canonical JSON][fr24.archive.request_json]. Fields that no longer
+    exist are dropped and new fields take their default, so that archives
+    outlive changes to the parameter classes."""
+    kwargs = {}
+    for f in fields(params_type):  # type: ignore[arg-type]
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        # annotations are strings, see `from __future__ import annotations`
+        if f.type == "BoundingBox":
+            value = BoundingBox(**value)
+        elif str(f.type).startswith("set["):
+            value = set(value)
+        kwargs[f.name] = value
+    return params_type(**kwargs)
+
+
+def replay(
+    archive: ResponseArchive,
+    endpoint: str | None = None,
+    *,
+    start: IntoTimestamp | None = None,
+    end: IntoTimestamp | None = None,
+) -> Iterator[APIResult[Any]]:
+    """Rebuild results from an archive, without any network access.
+
+    ```py
+    for result in replay(FR24Cache.default().archive, "live_feed"):
+        df = result.to_polars()
+    ```
+
+    :param endpoint: Only replay this endpoint, e.g. `live_feed`.
+    :param start: Only replay responses at or after this time.
+    :param end: Only replay responses before this time.
+    """
+    for entry in archive.entries(endpoint, start=start, end=end):
+        result_type = ENDPOINT_RESULTS[entry.endpoint]
+        request = _request_from_json(
+            ENDPOINT_PARAMS[entry.endpoint], entry.request
+        )
+        response = httpx.Response(
+            200,
+            content=archive.get(entry.hash),
+            headers={"date": formatdate(entry.timestamp, usegmt=True)},
+        )
+        if any(f.name == "timestamp" for f in fields(result_type)):
+            yield result_type(  # type: ignore[call-arg]
+                request=request,
+                response=response,
+                timestamp=entry.timestamp,
+            )
+        else:
+            yield result_type(request=request, response=response)
@@ -9,6 +9,26 @@ instead, we should use a dynamic bounding box that will change every 30 minutes
 to reduce the number of requests
 """
 
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..cache import PATH_CACHE
+from ..grpc import BoundingBox
+
+if TYPE_CHECKING:
+    from typing import Iterable, Sequence
+
+    from ..cache import TimestampedCache
+    from ..types import IntTimestampS
+    from ..types.cache import TabularFileFmt
+
+logger = logging.getLogger(__name__)
+
 # ruff: noqa: E501
 # fmt: off
 LNGS_WORLD_STATIC = [
@@ -70,5 +90,233 @@ LNGS_WORLD_PER_HALF_HR = {
 """
 Dynamic bounds every 30 minutes, 0 = 00:00UTC
 this is tuned on 2023-06-15: each slice should contain 1000 flights.
+
+See [fr24.static.bbox.calibrate_lngs_per_half_hr][] to retune it.
 """
 # fmt: on
+
+FP_LNGS_WORLD_PER_HALF_HR = PATH_CACHE / "lngs_world_per_half_hr.json"
+"""Default location of the calibrated longitude knots."""
+
+
+SECONDS_PER_SLOT = 1800
+"""Duration of each time slot in [LNGS_WORLD_PER_HALF_HR][fr24.static.bbox.LNGS_WORLD_PER_HALF_HR]"""
+
+
+def get_slot(timestamp: IntTimestampS) -> int:
+    """Index of the half-hour slot of the day, 0 = 00:00UTC."""
+    return (timestamp % 86400) // SECONDS_PER_SLOT
+
+
+def lngs_to_bboxes(lngs: Sequence[float]) -> list[BoundingBox]:
+    """Cut the world into vertical slices at the given longitude knots."""
+    return [
+        BoundingBox(-90, 90, lngs[i], lngs[i + 1]) for i in range(len(lngs) - 1)
+    ]
+
+
+def split_bbox(bbox: BoundingBox) -> list[BoundingBox]:
+    """Split a bounding box into four quadrants."""
+    lat_mid = (bbox.south + bbox.north) / 2
+    lon_mid = (bbox.west + bbox.east) / 2
+    return [
+        BoundingBox(bbox.south, lat_mid, bbox.west, lon_mid),
+        BoundingBox(bbox.south, lat_mid, lon_mid, bbox.east),
+        BoundingBox(lat_mid, bbox.north, bbox.west, lon_mid),
+        BoundingBox(lat_mid, bbox.north, lon_mid, bbox.east),
+    ]
+
+
+def merge_bboxes(a: BoundingBox, b: BoundingBox) -> BoundingBox | None:
+    """Merge two bounding boxes if they share a full edge, so that the union is
+    still a rectangle. Returns `None` otherwise."""
+    if math.isclose(a.south, b.south) and math.isclose(a.north, b.north):
+        if math.isclose(a.east, b.west):
+            return BoundingBox(a.south, a.north, a.west, b.east)
+        if math.isclose(b.east, a.west):
+            return BoundingBox(a.south, a.north, b.west, a.east)
+    if math.isclose(a.west, b.west) and math.isclose(a.east, b.east):
+        if math.isclose(a.north, b.south):
+            return BoundingBox(a.south, b.north, a.west, a.east)
+        if math.isclose(b.north, a.south):
+            return BoundingBox(b.south, a.north, a.west, a.east)
+    return None
+
+
+def calibrate_lngs_per_half_hr(
+    live_feed: TimestampedCache,
+    target: int = 1000,
+    *,
+    format: TabularFileFmt = "parquet",
+) -> dict[int, list[float]]:
+    """Compute longitude knots for each half-hour slot from recorded live feed
+    snapshots, such that each slice contains about `target` flights.
+
+    Snapshots are assumed to cover the entire world. Both individual and
+    [compacted][fr24.cache.TimestampedCache.compact] snapshots are read.
+    Slots without any snapshot fall back to [LNGS_WORLD_PER_HALF_HR][fr24.static.bbox.LNGS_WORLD_PER_HALF_HR].
+
+    :param live_feed: The live feed collection, i.e. `FR24Cache.live_feed`.
+    :param target: Desired number of flights in each slice.
+    """
+    import polars as pl
+
+    epoch = pl.col("snapshot_ts").dt.epoch("s")
+    data = (
+        live_feed.scan_all(format=format)
+        .select(
+            "longitude",
+            slot=((epoch % 86400) // SECONDS_PER_SLOT).cast(pl.UInt8()),
+            snapshot=epoch,
+        )
+        .collect()
+    )
+    knots = {slot: list(lngs) for slot, lngs in LNGS_WORLD_PER_HALF_HR.items()}
+    if data.is_empty():
+        logger.warning("no live feed snapshots found, using default knots")
+        return knots
+
+    for _, group in data.group_by("slot"):
+        slot = int(group["slot"][0])
+        num_snapshots = group["snapshot"].n_unique()
+        num_slices = max(1, math.ceil(group.height / num_snapshots / target))
+        longitudes = group["longitude"]
+        inner = sorted(
+            {
+                round(float(q), 1)
+                for i in range(1, num_slices)
+                if (q := longitudes.quantile(i / num_slices)) is not None
+            }
+            - {-180.0, 180.0}
+        )
+        knots[slot] = [-180.0, *inner, 180.0]
+        logger.info(
+            f"slot {slot}: {num_slices} slices from {num_snapshots} snapshots"
+        )
+    return knots
+
+
+def save_lngs_per_half_hr(
+    knots: dict[int, list[float]],
+    path: Path = FP_LNGS_WORLD_PER_HALF_HR,
+) -> None:
+    """Save calibrated longitude knots so they can be
+    [loaded][fr24.static.bbox.load_lngs_per_half_hr] later."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({str(k): v for k, v in sorted(knots.items())}))
+    logger.info(f"wrote longitude knots to `{path}`")
+
+
+def load_lngs_per_half_hr(
+    path: Path = FP_LNGS_WORLD_PER_HALF_HR,
+) -> dict[int, list[float]]:
+    """Load calibrated longitude knots, falling back to
+    [LNGS_WORLD_PER_HALF_HR][fr24.static.bbox.LNGS_WORLD_PER_HALF_HR] for
+    slots that are missing or if the file does not exist."""
+    knots = {slot: list(lngs) for slot, lngs in LNGS_WORLD_PER_HALF_HR.items()}
+    if path.exists():
+        knots.update(
+            {int(k): v for k, v in json.loads(path.read_text()).items()}
+        )
+    return knots
+
+
+def get_bboxes_world(
+    timestamp: IntTimestampS,
+    lngs_per_half_hr: dict[int, list[float]] | None = None,
+) -> list[BoundingBox]:
+    """Bounding boxes covering the entire world for the given time.
+
+    :param lngs_per_half_hr: Longitude knots for each slot. Defaults to the
+        [calibrated knots][fr24.static.bbox.load_lngs_per_half_hr], if any.
+    """
+    if lngs_per_half_hr is None:
+        lngs_per_half_hr = load_lngs_per_half_hr()
+    return lngs_to_bboxes(lngs_per_half_hr[get_slot(timestamp)])
+
+
+class AdaptiveTiler:
+    """Learns a tiling of the world for each half-hour slot of the day.
+
+    A tile returning as many flights as the request `limit` is most likely
+    truncated: it should be [split][fr24.static.bbox.AdaptiveTiler.split] into
+    quadrants and refetched. After a cycle, neighbouring tiles that are sparse
+    are merged back together. The resulting tiling is remembered, and reused
+    the next time the same slot is requested.
+
+    See [fr24.service.LiveFeedService.fetch_world][].
+    """
+
+    def __init__(
+        self,
+        initial: Sequence[BoundingBox] | None = None,
+        *,
+        lngs_per_half_hr: dict[int, list[float]] | None = None,
+        min_span: float = 0.5,
+        merge_ratio: float = 0.5,
+    ) -> None:
+        """
+        :param initial: Tiling to start from for slots that were never seen.
+            Defaults to the longitude knots for each half-hour slot, see
+            [fr24.static.bbox.get_bboxes_world][].
+        :param lngs_per_half_hr: Longitude knots used when `initial` is not
+            given. Defaults to the calibrated knots, if any.
+        :param min_span: Tiles narrower than this (degrees) are never split.
+        :param merge_ratio: Neighbouring tiles are merged when their combined
+            flight count is below this fraction of the limit.
+        """
+        self.initial = list(initial) if initial is not None else None
+        self.lngs_per_half_hr = lngs_per_half_hr
+        self.min_span = min_span
+        self.merge_ratio = merge_ratio
+        self.tilings: dict[int, list[BoundingBox]] = {}
+        """Learned tiling for each slot."""
+
+    def tiles(self, timestamp: IntTimestampS) -> list[BoundingBox]:
+        """Tiles to request for the given time."""
+        slot = get_slot(timestamp)
+        if (tiling := self.tilings.get(slot)) is not None:
+            return list(tiling)
+        if self.initial is not None:
+            return list(self.initial)
+        return get_bboxes_world(timestamp, self.lngs_per_half_hr)
+
+    def split(self, bbox: BoundingBox) -> list[BoundingBox]:
+        """Split a saturated tile into quadrants, or return an empty list if it
+        is already too small."""
+        if min(bbox.north - bbox.south, bbox.east - bbox.west) < self.min_span:
+            return []
+        return split_bbox(bbox)
+
+    def update(
+        self,
+        timestamp: IntTimestampS,
+        counts: Iterable[tuple[BoundingBox, int]],
+        limit: int,
+    ) -> list[BoundingBox]:
+        """Merge sparse neighbours and remember the tiling for this slot.
+
+        :param counts: Every tile fetched in this cycle (after splitting),
+            along with the number of flights it returned.
+        :param limit: Maximum number of flights per request.
+        """
+        tiles = list(counts)
+        threshold = self.merge_ratio * limit
+        while True:
+            best: tuple[int, int, BoundingBox, int] | None = None
+            for i, (a, count_a) in enumerate(tiles):
+                for j in range(i + 1, len(tiles)):
+                    b, count_b = tiles[j]
+                    total = count_a + count_b
+                    if total > threshold or (best and total >= best[3]):
+                        continue
+                    if (merged := merge_bboxes(a, b)) is not None:
+                        best = (i, j, merged, total)
+            if best is None:
+                break
+            i, j, merged, total = best
+            tiles[i] = (merged, total)
+            del tiles[j]
+        tiling = [bbox for bbox, _ in tiles]
+        self.tilings[get_slot(timestamp)] = tiling
+        return tiling
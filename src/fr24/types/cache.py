@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Annotated, Any, Literal, TypedDict, Union, get_type_hints
+from typing import (
+    Annotated,
+    Any,
+    Literal,
+    TypedDict,
+    TypeVar,
+    Union,
+    get_type_hints,
+)
 
 # NOTE: using `Union[X, Y]` instead of X | Y because get_type_hints with extras
 # on py39 fails
@@ -309,4 +317,90 @@ class PlaybackFlightRecord(
 
 
 playback_flight_schema = to_schema(PlaybackFlightRecord)
-TabularFileFmt = Literal["parquet", "csv"]  # TODO: support ndjson
+TabularFileFmt = Literal["parquet", "csv", "arrow"]  # TODO: support ndjson
+"""
+- `parquet`: compressed columnar storage, best for archival
+- `csv`: plain text, nested columns are not supported
+- `arrow`: Arrow IPC (Feather v2), memory-mapped for zero-copy reads of
+    frequently accessed data
+"""
+CacheLayout = Literal["flat", "hive"]
+
+SchemaProfile = Literal["default", "compact"]
+"""
+- `default`: the schemas above
+- `compact`: repetitive strings (callsigns, typecodes, airports...) are
+    stored as `pl.Categorical` and flight IDs in flight lists as u32, like
+    in the other schemas. This mainly shrinks `arrow` files: parquet
+    already dictionary-encodes strings. See
+    [fr24.types.cache.COMPACT_DTYPES][].
+"""
+
+COMPACT_DTYPES: dict[str, pl.DataType] = {
+    **{
+        name: pl.Categorical()
+        for name in (
+            "callsign",
+            "number",
+            "flight_number",
+            "registration",
+            "reg",
+            "typecode",
+            "type",
+            "origin",
+            "destination",
+            "from_iata",
+            "from_city",
+            "to_iata",
+            "to_city",
+            "status",
+        )
+    },
+    # current flight IDs are far below 2**32, as assumed by other schemas.
+    # the cast is checked, see `with_profile`
+    "flight_id": pl.UInt32(),
+}
+"""Overrides of the `compact` profile, applied to top-level columns of the
+same name."""
+
+
+def profile_schema(
+    schema: dict[str, pl.DataType], profile: SchemaProfile
+) -> dict[str, pl.DataType]:
+    """Return the schema under the given profile."""
+    if profile == "default":
+        return schema
+    return {
+        name: COMPACT_DTYPES.get(name, dtype)
+        # only narrow strings and integers: e.g. `status` is a u8 in
+        # `live_flights_status_schema`
+        if dtype in (pl.String(), pl.UInt64())
+        else dtype
+        for name, dtype in schema.items()
+    }
+
+
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
+
+def with_profile(frame: FrameT, profile: SchemaProfile) -> FrameT:
+    """Cast a frame with a default schema to the given profile.
+
+    :raises ValueError: If a flight ID does not fit in the `compact`
+        profile. Lazy frames raise when collected instead.
+    """
+    if profile == "default":
+        return frame
+    schema = dict(frame.collect_schema())
+    target = profile_schema(schema, profile)
+    if (
+        isinstance(frame, pl.DataFrame)
+        and target.get("flight_id") == pl.UInt32()
+        and isinstance(max_id := frame["flight_id"].max(), int)
+        and max_id > 0xFFFF_FFFF
+    ):
+        raise ValueError(
+            f"flight id {max_id:#x} does not fit in 32 bits, "
+            "use the `default` profile"
+        )
+    return frame.cast(target)  # type: ignore
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import email.utils
+import inspect
 import logging
+import os
 import re
 import sys
 import time
+import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -48,11 +52,11 @@ if TYPE_CHECKING:
         IntTimestampS,
         StrFlightIdHex,
     )
-    from .types.cache import TabularFileFmt
+    from .types.cache import SchemaProfile, TabularFileFmt
 
     _D = TypeVar("_D")
 
-    @dataclass_transform(frozen_default=True)
+    @dataclass_transform(frozen_default=True, field_specifiers=(field,))
     def dataclass_frozen(cls: type[_D]) -> type[_D]: ...
 else:
     dataclass_frozen = dataclass(**dataclass_opts)
@@ -154,7 +158,16 @@ def to_flight_id_hex(flight_id: IntoFlightId) -> StrFlightIdHex:
 
 @dataclass_frozen
 class BarePath:
+    """A path without the file extension, which is given by the format."""
+
     path: Path
+    on_write: Callable[[Path, TabularFileFmt, int], None] | None = field(
+        default=None, compare=False, repr=False
+    )
+    """Called with the path, format and number of rows after a table is
+    written to this path, e.g. to update the cache manifest."""
+    profile: SchemaProfile = field(default="default", compare=False)
+    """Column types of the table written to and read from this path."""
 
 
 FileLike = Union[str, Path, IO[bytes], BarePath]
@@ -165,6 +178,8 @@ def format_bare_path(path: BarePath, format: TabularFileFmt) -> Path:
         suffix = ".parquet"
     elif format == "csv":
         suffix = ".csv"
+    elif format == "arrow":
+        suffix = ".arrow"
     else:
         raise ValueError(f"unsupported format: `{format}`")
     return path.path.with_suffix(suffix)
@@ -193,6 +208,61 @@ def _handle_existing_file(
         assert_never(when_file_exists)
 
 
+@contextmanager
+def dir_lock(path: Path, name: str = ".lock") -> Iterator[None]:
+    """Hold an exclusive, advisory lock on a directory, shared by all
+    processes.
+
+    :param name: Name of the lock file created in the directory. Use
+        distinct names for unrelated critical sections.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / name, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_write(
+    path: Path, when_file_exists: FileExistsBehaviour = "overwrite"
+) -> Iterator[Path]:
+    """Yield a temporary path in the same directory as `path`, to be written
+    to. On success, it is atomically renamed to `path`, so readers never
+    observe a partially written file. On failure, it is removed.
+
+    Handling of an existing file and the rename happen under
+    [fr24.utils.dir_lock][], so that concurrent writers of the same path
+    do not race.
+    """
+    if when_file_exists == "error" and path.exists():
+        _handle_existing_file(path, when_file_exists)  # fail early
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:16]}.tmp")
+    try:
+        yield tmp
+        with dir_lock(path.parent):
+            _handle_existing_file(path, when_file_exists)
+            os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
 def write_table(
     result: SupportsToPolars,
     file: FileLike,
@@ -203,30 +273,169 @@ def write_table(
 ) -> None:
     """Writes the table as the specified format via polars.
 
+    Files on disk are written atomically, see [fr24.utils.atomic_write][].
+
     :param file: File path or writable file-like object. The path will be given
         an appropriate suffix if it is a [BarePath][fr24.utils.BarePath].
     """
 
+    on_write = None
+    profile: SchemaProfile = "default"
     if isinstance(file, BarePath):
+        on_write = file.on_write
+        profile = file.profile
         file = format_bare_path(file, format)
     if isinstance(file, str):
         file = Path(file)
-    if isinstance(file, Path):
-        _handle_existing_file(file, when_file_exists)
-        file.parent.mkdir(parents=True, exist_ok=True)
 
-    data = result.to_polars()
-    if format == "parquet":
-        # NOTE: saving metadata with polars is not yet implemented
-        # this means that useful unstructured metadata (e.g. flight details)
-        # cannot be saved without extra pyarrow dependency
-        # https://github.com/pola-rs/polars/issues/5117
-        data.write_parquet(file, **kwargs)
-    elif format == "csv":
-        data.write_csv(file, **kwargs)
+    from .types.cache import with_profile
+
+    data = with_profile(result.to_polars(), profile)
+    metadata = None
+    if format == "parquet" and isinstance(result, SupportsTableMetadata):
+        import orjson
+
+        metadata = {
+            TABLE_METADATA_KEY: orjson.dumps(
+                result.table_metadata(), default=_json_default
+            ).decode()
+        }
+
+    def write(target: Path | IO[bytes]) -> None:
+        if format == "parquet":
+            _write_parquet(data, target, metadata, **kwargs)
+        elif format == "csv":
+            data.write_csv(target, **kwargs)
+        elif format == "arrow":
+            # uncompressed by default, so it can be memory-mapped on read.
+            # pass `compression="lz4"` to trade some CPU for smaller files.
+            data.write_ipc(target, **kwargs)
+        else:
+            raise ValueError(f"unsupported format: `{format}`")
+
+    if isinstance(file, Path):
+        with atomic_write(file, when_file_exists) as tmp:
+            write(tmp)
     else:
-        raise ValueError(f"unsupported format: `{format}`")
+        write(file)
     logger.info(f"wrote {data.height} rows to `{file}`")
+    if on_write is not None and isinstance(file, Path):
+        on_write(file, format, data.height)
+
+
+def sink_table(
+    lf: pl.LazyFrame,
+    file: FileLike,
+    *,
+    format: TabularFileFmt = "parquet",
+    when_file_exists: FileExistsBehaviour = "backup",
+    **kwargs: Any,
+) -> int:
+    """Like [fr24.utils.write_table][], but streams a lazy frame to the file
+    with polars' streaming engine, so it is never fully materialised.
+
+    Returns the number of rows written.
+    """
+    import polars as pl
+
+    on_write = None
+    if isinstance(file, BarePath):
+        from .types.cache import with_profile
+
+        on_write = file.on_write
+        lf = with_profile(lf, file.profile)
+        file = format_bare_path(file, format)
+    if isinstance(file, str):
+        file = Path(file)
+
+    def sink(target: Path | IO[bytes]) -> None:
+        if format == "parquet":
+            lf.sink_parquet(target, **kwargs)
+        elif format == "csv":
+            lf.sink_csv(target, **kwargs)
+        elif format == "arrow":
+            lf.sink_ipc(target, **kwargs)
+        else:
+            raise ValueError(f"unsupported format: `{format}`")
+
+    if isinstance(file, Path):
+        with atomic_write(file, when_file_exists) as tmp:
+            sink(tmp)
+        # cheap for parquet: only the footer is read
+        num_rows = int(
+            scan_table(file, format=format).select(pl.len()).collect().item()
+        )
+    else:
+        sink(file)
+        num_rows = int(lf.select(pl.len()).collect().item())
+    logger.info(f"wrote {num_rows} rows to `{file}`")
+    if on_write is not None and isinstance(file, Path):
+        on_write(file, format, num_rows)
+    return num_rows
+
+
+TABLE_METADATA_KEY = "fr24"
+"""Key of the parquet key-value metadata written by
+[fr24.utils.write_table][]."""
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):  # NamedTuple
+        return obj._asdict()
+    return str(obj)
+
+
+def _write_parquet(
+    data: pl.DataFrame,
+    file: Path | IO[bytes],
+    metadata: dict[str, str] | None,
+    **kwargs: Any,
+) -> None:
+    import polars as pl
+
+    if metadata is None:
+        data.write_parquet(file, **kwargs)
+    elif "metadata" in inspect.signature(pl.DataFrame.write_parquet).parameters:
+        data.write_parquet(file, metadata=metadata, **kwargs)
+    else:  # older polars
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.debug(
+                "metadata not saved: requires a newer polars or pyarrow"
+            )
+            data.write_parquet(file, **kwargs)
+            return
+        table = data.to_arrow()
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), **metadata}
+        )
+        pq.write_table(table, file, **kwargs)
+
+
+def read_table_metadata(file: Path | str | IO[bytes]) -> dict[str, Any] | None:
+    """Read the context stored alongside a parquet table by
+    [fr24.utils.write_table][], e.g. the request parameters and server
+    timestamp. Only the footer of the file is read.
+
+    Returns `None` if the file has no such metadata.
+    """
+    import orjson
+    import polars as pl
+
+    kv: dict[str, str]
+    if hasattr(pl, "read_parquet_metadata"):
+        kv = pl.read_parquet_metadata(file)
+    else:  # older polars
+        import pyarrow.parquet as pq
+
+        raw = pq.read_schema(file).metadata or {}
+        kv = {k.decode(): v.decode() for k, v in raw.items()}
+    if (value := kv.get(TABLE_METADATA_KEY)) is None:
+        return None
+    return orjson.loads(value)  # type: ignore[no-any-return]
 
 
 def scan_table(
@@ -242,16 +451,25 @@ def scan_table(
         an appropriate suffix if it is a [BarePath][fr24.utils.BarePath].
     :param schema: The schema to enforce when reading the table. For CSV files,
         this should be specified to properly parse datetimes from strings.
+        For a [BarePath][fr24.utils.BarePath], it is adjusted to its profile.
     """
     import polars as pl
 
     if isinstance(file, BarePath):
+        if schema is not None:
+            from .types.cache import profile_schema
+
+            schema = profile_schema(schema, file.profile)
         file = format_bare_path(file, format)
 
     if format == "parquet":
         return pl.scan_parquet(file, schema=schema)
     elif format == "csv":
         return pl.scan_csv(file, schema=schema)
+    elif format == "arrow":
+        # memory-mapped: zero copy for uncompressed files
+        lf = pl.scan_ipc(file, memory_map=True)
+        return lf if schema is None else lf.cast(schema)  # type: ignore[arg-type]
     else:
         raise ValueError(f"unsupported format: `{format}`")
 
@@ -280,6 +498,14 @@ class SupportsToPolars(Protocol):
         ...
 
 
+@runtime_checkable
+class SupportsTableMetadata(Protocol):
+    def table_metadata(self) -> dict[str, Any]:
+        """Context to store alongside the table, e.g. the request
+        parameters. Must be serialisable to JSON."""
+        ...
+
+
 # instead of raising exceptions:
 # - in `fr24.json`: return a result type that stores the response body or any
 #   errors
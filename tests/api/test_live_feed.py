@@ -93,3 +93,15 @@ async def test_live_feed_file_ops(fr24: FR24, cache: FR24Cache) -> None:
     df_local = cache.live_feed.scan_table(result.timestamp).collect()
     assert df_local.equals(result.to_polars())
     # NOTE: metadata serialisation is not implemented
+
+
+@pytest.mark.anyio
+async def test_live_feed_world(fr24: FR24) -> None:
+    result = await fr24.live_feed.fetch_world(concurrency=4)
+    assert len(result.tiles) == len(BBOXES_WORLD_STATIC)
+    assert all(tile.elapsed > 0 for tile in result.tiles)
+
+    df = result.to_polars()
+    assert df.height > 100
+    assert df["flightid"].is_unique().all()
+    assert result.tile_stats()["num_flights"].sum() >= df.height
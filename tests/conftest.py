@@ -8,6 +8,7 @@ import pytest
 from rich.logging import RichHandler
 
 from fr24 import FR24, FR24Cache
+from fr24.ratelimit import RateLimiter
 
 
 def pytest_configure(config: pytest.Config) -> None:
@@ -22,9 +23,20 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
+@pytest.fixture(scope="session")
+def ratelimiter() -> RateLimiter:
+    """Shared by all API tests to avoid overloading the server."""
+    return RateLimiter()
+
+
 @pytest.fixture(scope="session", autouse=True)
-async def client() -> AsyncGenerator[httpx.AsyncClient, None]:
-    async with httpx.AsyncClient(http1=False, http2=True) as client:
+async def client(
+    ratelimiter: RateLimiter,
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    transport = httpx.AsyncHTTPTransport(http1=False, http2=True)
+    async with httpx.AsyncClient(
+        http1=False, http2=True, transport=ratelimiter.transport(transport)
+    ) as client:
         yield client
 
 
@@ -36,6 +48,6 @@ def cache() -> FR24Cache:
 
 
 @pytest.fixture(scope="session", autouse=True)
-async def fr24() -> AsyncGenerator[FR24, None]:
-    async with FR24() as fr24:
+async def fr24(ratelimiter: RateLimiter) -> AsyncGenerator[FR24, None]:
+    async with FR24(ratelimiter=ratelimiter) as fr24:
         yield fr24
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import cast
+
+import httpx
+import orjson
+import pytest
+
+from fr24 import FR24, FR24Cache
+from fr24.grpc import BoundingBox
+from fr24.json import PlaybackParams
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+from fr24.service import LiveFeedResult, PlaybackResult, replay
+
+
+def test_archive_dedup(tmp_path: Path) -> None:
+    archive = FR24Cache(tmp_path).archive
+    assert not archive.path.exists()  # created lazily
+    content = b"hello world" * 1000
+    h1 = archive.put("find", "a", content, timestamp=1)
+    h2 = archive.put("find", "b", content, timestamp=2)
+    assert h1 == h2
+    assert archive.get(h1) == content
+    (segment,) = archive.path.glob("*.zst")
+    assert segment.stat().st_size < len(content) // 10
+    assert [e.request for e in archive.entries("find", start=2)] == ["b"]
+    assert [e.request for e in archive.entries(request="a")] == ["a"]
+    with pytest.raises(KeyError):
+        archive.get("0" * 64)
+
+
+@pytest.mark.anyio
+async def test_archive_replay(tmp_path: Path) -> None:
+    num_requests = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal num_requests
+        num_requests += 1
+        if request.url.host == "data-feed.flightradar24.com":
+            flights = [Flight(flightid=i) for i in range(num_requests)]
+            return httpx.Response(
+                200,
+                content=encode_message(LiveFeedResponse(flights_list=flights)),
+                headers={"date": f"Wed, 01 Jan 2025 00:00:0{num_requests} GMT"},
+            )
+        return httpx.Response(200, json={"result": {"response": {}}})
+
+    archive = FR24Cache(tmp_path).archive
+    bbox = BoundingBox(-90, 90, -180, 180)
+    async with FR24(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ratelimiter=None,
+        archive=archive,
+    ) as fr24:
+        live = [await fr24.live_feed.fetch(bounding_box=bbox) for _ in range(2)]
+        playback = await fr24.playback.fetch(flight_id=0x2D1E0A03)
+
+    replayed = [cast(LiveFeedResult, r) for r in replay(archive, "live_feed")]
+    assert all(isinstance(r, LiveFeedResult) for r in replayed)
+    assert [r.timestamp for r in replayed] == [r.timestamp for r in live]
+    for a, b in zip(replayed, live):
+        assert a.request == b.request
+        assert a.to_polars().equals(b.to_polars())
+
+    (replayed_playback,) = replay(archive, "playback")
+    assert isinstance(replayed_playback, PlaybackResult)
+    assert replayed_playback.to_dict() == playback.to_dict()
+    assert len(list(replay(archive, start=1735689602))) == 2
+
+    # params are stored as JSON and rebuilt even if their class changed
+    (request,) = archive.db.execute(
+        "SELECT request FROM entries WHERE endpoint = 'playback'"
+    ).fetchone()
+    assert orjson.loads(request) == {"flight_id": 0x2D1E0A03, "timestamp": None}
+    archive.db.execute(
+        "UPDATE entries SET request = ? WHERE endpoint = 'playback'",
+        ('{"flight_id": 1, "removed_field": 2}',),
+    )
+    (replayed_playback,) = replay(archive, "playback")
+    assert replayed_playback.request == PlaybackParams(flight_id=1)
+
+
+def test_request_key_independent_of_hash_seed() -> None:
+    code = (
+        "from fr24.archive import request_key\n"
+        "from fr24.grpc import BoundingBox, LiveFeedParams\n"
+        "fields = {'flight', 'reg', 'route', 'type', 'squawk', 'vspeed'}\n"
+        "params = LiveFeedParams(BoundingBox(1, 2, 3, 4), fields=fields)\n"
+        "print(request_key(params))\n"
+    )
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in range(4)
+    }
+    assert len(keys) == 1
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import polars as pl
+
+from fr24 import FR24Cache
+from fr24.grpc import BoundingBox
+from fr24.static.bbox import (
+    LNGS_WORLD_PER_HALF_HR,
+    AdaptiveTiler,
+    calibrate_lngs_per_half_hr,
+    get_slot,
+    load_lngs_per_half_hr,
+    merge_bboxes,
+    save_lngs_per_half_hr,
+    split_bbox,
+)
+
+
+def test_split_merge_bbox() -> None:
+    bbox = BoundingBox(-10, 10, 0, 40)
+    sw, se, nw, ne = split_bbox(bbox)
+    assert sw == BoundingBox(-10, 0, 0, 20)
+    assert ne == BoundingBox(0, 10, 20, 40)
+    assert merge_bboxes(sw, se) == BoundingBox(-10, 0, 0, 40)
+    assert merge_bboxes(nw, sw) == BoundingBox(-10, 10, 0, 20)
+    assert merge_bboxes(sw, ne) is None
+
+
+def test_adaptive_tiler_memory() -> None:
+    tiler = AdaptiveTiler(
+        lngs_per_half_hr=LNGS_WORLD_PER_HALF_HR, merge_ratio=0.5
+    )
+    ts = 86400 * 100 + 1800 * 3 + 60
+    assert get_slot(ts) == 3
+    assert len(tiler.tiles(ts)) == len(LNGS_WORLD_PER_HALF_HR[3]) - 1
+
+    west, east = BoundingBox(-90, 90, -180, 0), BoundingBox(-90, 90, 0, 180)
+    tiler.update(ts, [(west, 100), (east, 1400)], limit=1500)
+    assert tiler.tiles(ts) == [west, east]
+    tiler.update(ts, [(west, 100), (east, 200)], limit=1500)
+    assert tiler.tiles(ts) == [BoundingBox(-90, 90, -180, 180)]
+    # other slots are unaffected
+    assert len(tiler.tiles(ts + 1800)) == len(LNGS_WORLD_PER_HALF_HR[4]) - 1
+    assert tiler.split(BoundingBox(0, 0.1, 0, 0.1)) == []
+
+
+def test_calibrate_lngs(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    cache.live_feed.collection.path.mkdir(parents=True)
+    for i, timestamp in enumerate([1800 * 5 + 10, 1800 * 5 + 20]):
+        fp = cache.live_feed.get_path(timestamp).path.with_suffix(".parquet")
+        lngs = [-180 + (j + i) * 360 / 3001 for j in range(3000)]
+        pl.DataFrame({"longitude": lngs}).select(
+            pl.lit(None, dtype).alias(name)
+            if name != "longitude"
+            else pl.col(name).cast(dtype)
+            for name, dtype in cache.live_feed.schema.items()
+        ).write_parquet(fp)
+
+    knots = calibrate_lngs_per_half_hr(cache.live_feed, target=1000)
+    assert cache.live_feed.compact(end=1800 * 6)
+    assert calibrate_lngs_per_half_hr(cache.live_feed, target=1000) == knots
+    assert knots[5][0] == -180 and knots[5][-1] == 180
+    assert len(knots[5]) == 4  # 3000 flights / 1000 = 3 slices
+    assert abs(knots[5][1] + 60) < 1 and abs(knots[5][2] - 60) < 1
+    assert knots[6] == LNGS_WORLD_PER_HALF_HR[6]
+
+    fp = tmp_path / "knots.json"
+    save_lngs_per_half_hr({5: knots[5]}, fp)
+    loaded = load_lngs_per_half_hr(fp)
+    assert loaded[5] == knots[5]
+    assert loaded[6] == LNGS_WORLD_PER_HALF_HR[6]
+    tiler = AdaptiveTiler(lngs_per_half_hr=loaded)
+    assert len(tiler.tiles(1800 * 5)) == 3
@@ -0,0 +1,314 @@
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+import polars as pl
+import pytest
+
+from fr24 import FR24Cache
+from fr24.cache import CacheLimits
+from fr24.grpc import BoundingBox, LiveFeedParams
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+from fr24.service import LiveFeedResult
+from fr24.types.cache import (
+    CacheLayout,
+    TabularFileFmt,
+    flight_list_schema,
+    with_profile,
+)
+from fr24.utils import FileExistsBehaviour
+
+
+def make_live_feed_result(timestamp: int, num_flights: int) -> LiveFeedResult:
+    flights = [Flight(flightid=i) for i in range(num_flights)]
+    return LiveFeedResult(
+        request=LiveFeedParams(bounding_box=BoundingBox(-90, 90, -180, 180)),
+        response=httpx.Response(
+            200,
+            content=encode_message(LiveFeedResponse(flights_list=flights)),
+        ),
+        timestamp=timestamp,
+    )
+
+
+def test_manifest_query(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    for ts in range(100, 110):
+        make_live_feed_result(ts, ts - 99).write_table(cache)
+
+    files = cache.live_feed.query(start=103, end=106)
+    assert [f.name for f in files] == [
+        "103.parquet",
+        "104.parquet",
+        "105.parquet",
+    ]
+    assert cache.live_feed.query(start=105, format="csv") == []
+    assert cache.top_flights.query() == []
+    ((num_rows, size),) = cache.manifest.db.execute(
+        "SELECT num_rows, size FROM files WHERE path = 'feed/109.parquet'"
+    )
+    assert num_rows == 10
+    assert size == (tmp_path / "feed" / "109.parquet").stat().st_size
+
+    # rewriting a file replaces its entry
+    make_live_feed_result(109, 3).write_table(
+        cache, when_file_exists="overwrite"
+    )
+    assert len(cache.live_feed.query(start=109)) == 1
+
+
+def test_manifest_upgrade(tmp_path: Path) -> None:
+    with sqlite3.connect(tmp_path / "manifest.sqlite") as db:
+        db.execute(
+            "CREATE TABLE files (path TEXT PRIMARY KEY, collection TEXT "
+            "NOT NULL, key TEXT, flight_id INTEGER, timestamp INTEGER, "
+            "format TEXT NOT NULL, num_rows INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, mtime REAL NOT NULL)"
+        )
+    db.close()
+    cache = FR24Cache(tmp_path)
+    make_live_feed_result(100, 1).write_table(cache)
+    assert len(cache.live_feed.query(start=100)) == 1
+
+
+def test_manifest_reindex(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    for ts in (100, 200):
+        make_live_feed_result(ts, 2).write_table(cache)
+    (tmp_path / "flight_details").mkdir()
+    pl.DataFrame({"a": [1, 2, 3]}).write_parquet(
+        tmp_path / "flight_details" / "2D1E0A03_300.parquet"
+    )
+    (tmp_path / "feed" / "not_a_timestamp.parquet").touch()
+    cache.manifest.clear()
+    assert cache.live_feed.query() == []
+
+    assert cache.reindex() == 3
+    assert len(cache.live_feed.query()) == 2
+    (file,) = cache.flight_details.query(flight_id=0x2D1E0A03, start=300)
+    assert file.scan_table().collect().height == 3
+
+
+@pytest.mark.parametrize(
+    "layout, format",
+    [("flat", "parquet"), ("hive", "parquet"), ("hive", "arrow")],
+)
+def test_scan_range(
+    tmp_path: Path, layout: CacheLayout, format: TabularFileFmt
+) -> None:
+    cache = FR24Cache(tmp_path, layout=layout)
+    # 2024-01-01T00:59:00Z, 01:00:00Z, 01:30:00Z, 02:00:00Z
+    timestamps = [1704070740, 1704070800, 1704072600, 1704074400]
+    for i, ts in enumerate(timestamps):
+        make_live_feed_result(ts, i + 1).write_table(cache, format=format)
+    if layout == "hive":
+        assert (
+            tmp_path / f"feed/date=2024-01-01/hour=01/1704072600.{format}"
+        ).exists()
+    lf = cache.live_feed.scan_table(1704072600, format=format)
+    assert lf.collect_schema() == cache.live_feed.schema
+
+    df = cache.live_feed.scan_range(
+        1704070800, 1704074400, format=format
+    ).collect()
+    assert df.height == 2 + 3
+    assert df["snapshot_ts"].dt.epoch("s").unique().sort().to_list() == [
+        1704070800,
+        1704072600,
+    ]
+    assert df.columns[:-1] == list(cache.live_feed.schema)
+    assert cache.live_feed.scan_range(0, 100).collect().height == 0
+    assert cache.reindex() == 4
+
+
+def test_compact(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path, layout="hive")
+    # 4 snapshots in 2024-01-01T00, 2 in 01
+    timestamps = [1704067200 + 600 * i for i in range(4)] + [
+        1704070800,
+        1704071400,
+    ]
+    for i, ts in enumerate(timestamps):
+        make_live_feed_result(ts, 3 - i % 2).write_table(cache)
+    before = cache.live_feed.scan_range(0, 1704074400).collect()
+
+    (file,) = cache.live_feed.compact(end=1704070800)
+    assert file.name == "1704067200-1704069000.parquet"
+    assert [p.name for p in file.parent.glob("*.parquet")] == [file.name]
+    after = cache.live_feed.scan_range(0, 1704074400).collect()
+    assert after.sort(after.columns).equals(before.sort(before.columns))
+    assert file.scan_table().collect()["flightid"].is_sorted()
+    assert len(cache.live_feed.query()) == 3
+    assert cache.live_feed.query(start=1704067800, end=1704070800) == [file]
+    assert cache.live_feed.query(start=1704069001, end=1704070800) == []
+
+    sub = cache.live_feed.scan_range(1704067800, 1704068400).collect()
+    assert sub["snapshot_ts"].dt.epoch("s").unique().to_list() == [1704067800]
+    snapshot = cache.live_feed.scan_table(1704067800).collect()
+    assert snapshot.equals(sub.drop("snapshot_ts"))
+
+    # late snapshots are merged into the existing file
+    make_live_feed_result(1704070000, 1).write_table(cache)
+    (file,) = cache.live_feed.compact(end=1704070800)
+    assert file.name == "1704067200-1704070000.parquet"
+    assert cache.live_feed.query(end=1704070800) == [file]
+    cache.manifest.clear()
+    cache.reindex()
+    assert cache.live_feed.query(start=1704070000, end=1704070800) == [file]
+    assert cache.live_feed.compact(end=1704070800) == []
+
+
+def test_compact_superseded_file(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    for ts in (1704067200, 1704067800):
+        make_live_feed_result(ts, 1).write_table(cache)
+    (old,) = cache.live_feed.compact(end=1704070800)
+    content = old.read_bytes()
+    make_live_feed_result(1704068400, 1).write_table(cache)
+    (new,) = cache.live_feed.compact(end=1704070800)
+    # state seen by readers before the superseded file is deleted
+    old.write_bytes(content)
+    assert cache.live_feed.files_in_range(0, 1704070800) == [new]
+    assert cache.live_feed.scan_range(0, 1704070800).collect().height == 3
+
+
+def test_gc(tmp_path: Path) -> None:
+    limits = CacheLimits(collection_max_bytes={"feed": 0}, check_every=1)
+    cache = FR24Cache(tmp_path, limits=limits)
+    for ts in (100, 200, 300):
+        make_live_feed_result(ts, 10).write_table(cache)
+    # evicted on write: a zero budget leaves nothing behind
+    assert cache.live_feed.query() == []
+
+    cache = FR24Cache(tmp_path)
+    for ts in (100, 200, 300):
+        make_live_feed_result(ts, 10).write_table(cache)
+        os.utime(tmp_path / f"feed/{ts}.parquet", (ts, ts))
+    cache.reindex()
+    size = (tmp_path / "feed/300.parquet").stat().st_size
+    (tmp_path / "playback").mkdir()
+    pl.DataFrame({"a": [1]}).write_parquet(
+        tmp_path / "playback/2D1E0A03.parquet"
+    )
+    cache.reindex()
+
+    evicted = cache.gc(CacheLimits(max_bytes=2 * size))
+    assert [p.name for p in evicted] == ["100.parquet"]
+    assert [f.name for f in cache.live_feed.query()] == [
+        "200.parquet",
+        "300.parquet",
+    ]
+    assert cache.gc(CacheLimits(max_bytes=0))
+    assert cache.live_feed.query() == []
+    assert len(cache.playback.query()) == 1  # pinned
+
+
+def _write_snapshots(path: str, when_file_exists: FileExistsBehaviour) -> None:
+    cache = FR24Cache(path)
+    for i in range(10):
+        make_live_feed_result(100, i + 1).write_table(
+            cache, when_file_exists=when_file_exists
+        )
+
+
+@pytest.mark.parametrize("when_file_exists", ["overwrite", "backup"])
+def test_concurrent_writers(
+    tmp_path: Path, when_file_exists: FileExistsBehaviour
+) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(3, mp_context=ctx) as executor:
+        futures = [
+            executor.submit(_write_snapshots, str(tmp_path), when_file_exists)
+            for _ in range(3)
+        ]
+        for future in futures:
+            future.result()
+
+    feed = tmp_path / "feed"
+    assert not list(feed.glob("*.tmp"))
+    num_rows = pl.read_parquet(feed / "100.parquet").height
+    assert 1 <= num_rows <= 10
+    if when_file_exists == "backup":
+        assert len(list(feed.glob("100.parquet.bkp.*"))) == 3 * 10 - 1
+    assert len(FR24Cache(tmp_path).live_feed.query()) == 1
+
+
+def test_scan_all(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    schema = cache.playback.table_schema
+    (tmp_path / "playback").mkdir()
+    for fid in (0x2D1E0A03, 0x3A0B0C0D):
+        pl.select(
+            pl.lit(None, dtype).alias(name) for name, dtype in schema.items()
+        ).select(pl.all().repeat_by(3).explode()).with_columns(
+            altitude=pl.Series([1000, 2000, 3000], dtype=pl.Int32)
+        ).write_parquet(tmp_path / f"playback/{fid:0X}.parquet")
+    make_live_feed_result(100, 2).write_table(cache)
+    make_live_feed_result(200, 3).write_table(cache)
+    cache.reindex()
+
+    df = cache.playback.scan_all().filter(pl.col("altitude") > 1000).collect()
+    assert df.columns == [*schema, "flight_id"]
+    assert df["flight_id"].to_list() == [0x2D1E0A03] * 2 + [0x3A0B0C0D] * 2
+
+    df = cache.live_feed.scan_all().collect()
+    assert df.group_by("snapshot_ts").len().sort("snapshot_ts")[
+        "len"
+    ].to_list() == [2, 3]
+
+    lf = cache.flight_details.scan_all()
+    assert lf.collect().height == 0
+    assert lf.collect_schema()["flight_id"] == pl.UInt64()
+
+
+def test_table_metadata(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    make_live_feed_result(100, 2).write_table(cache)
+    (file,) = cache.live_feed.query()
+    metadata = file.metadata()
+    assert metadata is not None
+    assert metadata["timestamp"] == 100
+    assert metadata["request"]["bounding_box"] == {
+        "south": -90,
+        "north": 90,
+        "west": -180,
+        "east": 180,
+    }
+    assert metadata["request"]["fields"] == ["flight", "reg", "route", "type"]
+    assert file.scan_table().collect().height == 2
+
+    make_live_feed_result(200, 2).write_table(cache, format="arrow")
+    (file,) = cache.live_feed.query(format="arrow")
+    assert file.metadata() is None
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_compact_profile(tmp_path: Path, format: TabularFileFmt) -> None:
+    cache = FR24Cache(tmp_path, profile="compact")
+    make_live_feed_result(100, 2).write_table(cache, format=format)
+    make_live_feed_result(200, 3).write_table(cache, format=format)
+
+    df = cache.live_feed.scan_table(100, format=format).collect()
+    assert df.schema["callsign"] == pl.Categorical()
+    assert df.schema["flightid"] == pl.UInt32()
+    assert df.height == 2
+
+    df = cache.live_feed.scan_range(100, 300, format=format).collect()
+    assert df.schema["typecode"] == pl.Categorical()
+    assert df.height == 5
+
+
+def test_compact_profile_flight_id_overflow() -> None:
+    df = pl.DataFrame(
+        {"flight_id": [0x2D1E0A03]},
+        schema={"flight_id": flight_list_schema["flight_id"]},
+    )
+    assert with_profile(df, "compact").schema["flight_id"] == pl.UInt32()
+    with pytest.raises(ValueError, match="32 bits"):
+        with_profile(
+            df.with_columns(flight_id=pl.lit(1 << 32, pl.UInt64)), "compact"
+        )
@@ -0,0 +1,94 @@
+import random
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from fr24.grpc import (
+    live_feed_df,
+    live_feed_flightdata_dict,
+    live_feed_playback_df,
+    nearest_flights_df,
+    nearest_flights_nearbyflight_dict,
+)
+from fr24.proto.v1_pb2 import (
+    DataSource,
+    ExtraFlightInfo,
+    Flight,
+    LiveFeedResponse,
+    NearbyFlight,
+    NearestFlightsResponse,
+    PlaybackResponse,
+    PositionBuffer,
+    RecentPosition,
+    Route,
+    Schedule,
+)
+from fr24.types.cache import live_feed_schema, nearest_flights_schema
+
+
+def make_flight(rng: random.Random, flightid: int) -> Flight:
+    return Flight(
+        flightid=flightid,
+        lat=rng.uniform(-90, 90),
+        lon=rng.uniform(-180, 180),
+        track=rng.randrange(360),
+        alt=rng.randrange(-1000, 45000),
+        speed=rng.randrange(600),
+        on_ground=rng.random() < 0.1,
+        callsign=f"CPA{flightid}",
+        source=DataSource.ValueType(rng.randrange(10)),
+        timestamp_ms=1_700_000_000_000 + rng.randrange(60_000),
+        extra_info=ExtraFlightInfo(
+            reg="B-HNR",
+            route=Route(**{"from": "HKG", "to": "LHR"}),
+            type="B77W",
+            schedule=Schedule(eta=rng.randrange(1 << 31)),
+            squawk=rng.randrange(0o7777),
+            vspeed=rng.randrange(-4000, 4000),
+        ),
+        position_buffer=PositionBuffer(
+            recent_positions_list=[
+                RecentPosition(
+                    delta_lat=rng.randrange(-1000, 1000),
+                    delta_lon=rng.randrange(-1000, 1000),
+                    delta_ms=rng.randrange(10_000),
+                )
+                for _ in range(rng.randrange(4))  # some are empty
+            ]
+        ),
+    )
+
+
+def test_live_feed_df_columnar() -> None:
+    rng = random.Random(0)
+    flights = [make_flight(rng, i) for i in range(200)]
+    expected = pl.DataFrame(
+        [live_feed_flightdata_dict(lfr) for lfr in flights],
+        schema=live_feed_schema,
+    )
+
+    df = live_feed_df(LiveFeedResponse(flights_list=flights))
+    assert_frame_equal(df, expected)
+    playback = PlaybackResponse(
+        live_feed_response=LiveFeedResponse(flights_list=flights)
+    )
+    assert_frame_equal(live_feed_playback_df(playback), expected)
+    assert_frame_equal(
+        live_feed_df(LiveFeedResponse()),
+        pl.DataFrame(schema=live_feed_schema),
+    )
+
+
+def test_nearest_flights_df_columnar() -> None:
+    rng = random.Random(1)
+    response = NearestFlightsResponse(
+        flights_list=[
+            NearbyFlight(flight=make_flight(rng, i), distance=i * 100)
+            for i in range(50)
+        ]
+    )
+    expected = pl.DataFrame(
+        [nearest_flights_nearbyflight_dict(nf) for nf in response.flights_list],
+        schema=nearest_flights_schema,
+    )
+    assert_frame_equal(nearest_flights_df(response), expected)
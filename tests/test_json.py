@@ -0,0 +1,106 @@
+import random
+from typing import Any
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from fr24.json import (
+    flight_list_dict,
+    flight_list_items_df,
+    playback_track_df,
+    playback_track_dict,
+)
+from fr24.types.cache import flight_list_schema, playback_track_schema
+
+
+def make_ems(rng: random.Random, timestamp: int) -> dict[str, Any]:
+    return {
+        "ts": timestamp,
+        "ias": rng.randrange(300),
+        "tas": rng.randrange(500),
+        "mach": rng.randrange(900),
+        "mcp": None,
+        "fms": rng.randrange(40000),
+        "autopilot": None,
+        "oat": rng.randrange(-60, 30),
+        "trueTrack": rng.uniform(0, 360),
+        "rollAngle": rng.uniform(-30, 30),
+        "qnh": None,
+        "windDir": rng.randrange(360),
+        "windSpd": rng.randrange(150),
+        "precision": rng.randrange(8),
+        "altGPS": rng.randrange(40000),
+        "emergencyStatus": 0,
+        "tcasAcasDtatus": 0,
+        "heading": rng.randrange(360),
+    }
+
+
+def make_track_point(rng: random.Random, timestamp: int) -> Any:
+    return {
+        "latitude": rng.uniform(-90, 90),
+        "longitude": rng.uniform(-180, 180),
+        "altitude": {"feet": rng.randrange(45000), "meters": 0},
+        "speed": {"kts": rng.randrange(600), "kmh": 0.0, "mph": 0.0},
+        "verticalSpeed": {"fpm": rng.randrange(-4000, 4000), "ms": 0},
+        "heading": rng.randrange(360),
+        "squawk": f"{rng.randrange(0o10000):04o}",
+        "timestamp": timestamp,
+        "ems": make_ems(rng, timestamp) if rng.random() < 0.3 else None,
+    }
+
+
+def test_playback_track_df_columnar() -> None:
+    rng = random.Random(0)
+    track = [make_track_point(rng, 1_700_000_000 + i) for i in range(500)]
+    expected = pl.DataFrame(
+        [playback_track_dict(point) for point in track],
+        schema=playback_track_schema,
+    )
+    assert_frame_equal(playback_track_df(track), expected)
+    assert_frame_equal(
+        playback_track_df([]), pl.DataFrame(schema=playback_track_schema)
+    )
+
+
+def maybe(rng: random.Random, value: Any) -> Any:
+    return value if rng.random() < 0.8 else None
+
+
+def make_flight_list_item(rng: random.Random) -> Any:
+    def times() -> dict[str, int | None]:
+        return {
+            "departure": maybe(rng, 1_700_000_000 + rng.randrange(10**6)),
+            "arrival": maybe(rng, 1_700_000_000 + rng.randrange(10**6)),
+        }
+
+    def airport() -> Any:
+        return maybe(rng, {"code": {"icao": rng.choice(["VHHH", "EGLL"])}})
+
+    return {
+        "identification": {
+            "id": maybe(rng, f"{rng.randrange(1 << 32):x}"),
+            "number": {"default": maybe(rng, "CX8747")},
+            "callsign": maybe(rng, "CPA8747"),
+        },
+        "status": {"text": maybe(rng, "Landed 12:34")},
+        "aircraft": {
+            "hex": maybe(rng, f"{rng.randrange(1 << 24):x}"),
+            "registration": maybe(rng, "B-HPB"),
+            "model": {"code": "A359"},
+        },
+        "airport": {"origin": airport(), "destination": airport()},
+        "time": {"scheduled": times(), "estimated": times(), "real": times()},
+    }
+
+
+def test_flight_list_items_df_columnar() -> None:
+    rng = random.Random(0)
+    flights = [make_flight_list_item(rng) for _ in range(500)]
+    expected = pl.DataFrame(
+        [flight_list_dict(f) for f in flights], schema=flight_list_schema
+    )
+    assert_frame_equal(flight_list_items_df(flights), expected)
+    assert_frame_equal(
+        flight_list_items_df([]), pl.DataFrame(schema=flight_list_schema)
+    )
@@ -0,0 +1,64 @@
+import pytest
+
+from fr24.proto import (
+    FrameDecoder,
+    GrpcError,
+    decompress,
+    encode_message,
+    parse_data,
+    supported_encodings,
+)
+from fr24.proto.headers import get_grpc_headers
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+
+
+@pytest.mark.parametrize("encoding", supported_encodings())
+def test_compressed_message_roundtrip(encoding) -> None:
+    msg = LiveFeedResponse(
+        flights_list=[Flight(flightid=i, callsign="CPA1") for i in range(100)]
+    )
+    data = encode_message(msg, encoding)
+    assert data[0] == 1
+    assert len(data) < len(encode_message(msg))
+    assert parse_data(data, LiveFeedResponse, encoding).unwrap() == msg
+    # encoding is sniffed from the magic bytes if not given
+    assert parse_data(data, LiveFeedResponse).unwrap() == msg
+
+
+def test_compressed_message_invalid() -> None:
+    data = b"\x01" + (4).to_bytes(4, "big") + b"abcd"
+    err = parse_data(data, LiveFeedResponse).err()
+    assert isinstance(err, GrpcError)
+    with pytest.raises(ValueError):
+        decompress(b"abcd", "br")  # type: ignore[arg-type]
+
+
+def test_grpc_headers_encoding() -> None:
+    headers = get_grpc_headers(auth=None)
+    assert "gzip" in headers["grpc-accept-encoding"].split(",")
+    assert "grpc-encoding" not in headers
+    headers = get_grpc_headers(auth=None, encoding="gzip")
+    assert headers["grpc-encoding"] == "gzip"
+
+
+def test_frame_decoder_split_and_coalesced() -> None:
+    msgs = [
+        encode_message(LiveFeedResponse(flights_list=[Flight(flightid=i)] * i))
+        for i in range(1, 20)
+    ]
+    trailers = b"\x80" + (15).to_bytes(4, "big") + b"grpc-status:0\r\n"
+    stream = b"".join(msgs) + trailers
+    for size in (1, 3, 7, 64, len(stream)):
+        decoder = FrameDecoder()
+        frames = []
+        for i in range(0, len(stream), size):
+            frames.extend(decoder.feed(stream[i : i + size]))
+        assert frames == [*msgs, trailers]
+        assert decoder.pending == b""
+        assert len(decoder._buffer) < 2 * max(map(len, frames)) + size
+
+    decoder = FrameDecoder()
+    assert decoder.feed(msgs[0][:-1]) == []
+    assert decoder.pending == msgs[0][:-1]
+    err = parse_data(decoder.pending, LiveFeedResponse).err()
+    assert isinstance(err, GrpcError)
@@ -0,0 +1,623 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from fr24 import FR24, FR24Cache
+from fr24.cache import ResponseCache
+from fr24.grpc import BoundingBox, LiveFeedParams, LiveFeedPlaybackParams
+from fr24.json import FlightListParams, PlaybackParams, flight_list_df
+from fr24.proto import GrpcEncoding, encode_message, parse_data
+from fr24.proto.v1_pb2 import (
+    ExtendedFlightInfo,
+    Flight,
+    FollowFlightRequest,
+    FollowFlightResponse,
+    LiveFeedRequest,
+    LiveFeedResponse,
+)
+from fr24.ratelimit import RateLimiter, TokenBucket
+from fr24.service import (
+    FlightListResult,
+    FlightListResultCollection,
+    LiveFeedResult,
+    LiveFeedTile,
+    LiveFeedWorldResult,
+)
+from fr24.static.bbox import AdaptiveTiler
+from fr24.types.cache import live_feed_schema
+from fr24.types.grpc import LiveFeedField
+
+
+def make_live_feed_result(
+    bounding_box: BoundingBox, flights: list[Flight], timestamp: int
+) -> LiveFeedResult:
+    response = httpx.Response(
+        200, content=encode_message(LiveFeedResponse(flights_list=flights))
+    )
+    return LiveFeedResult(
+        request=LiveFeedParams(bounding_box=bounding_box),
+        response=response,
+        timestamp=timestamp,
+    )
+
+
+def test_live_feed_world_dedup() -> None:
+    west = BoundingBox(-90, 90, -180, 0)
+    east = BoundingBox(-90, 90, 0, 180)
+    result = LiveFeedWorldResult(
+        tiles=[
+            LiveFeedTile(
+                make_live_feed_result(
+                    west,
+                    [
+                        Flight(flightid=1, timestamp_ms=1_000, lon=-1),
+                        Flight(flightid=2, timestamp_ms=1_000, lon=-0.1),
+                    ],
+                    timestamp=10,
+                ),
+                elapsed=0.1,
+                num_flights=2,
+            ),
+            LiveFeedTile(
+                make_live_feed_result(
+                    east,
+                    [
+                        Flight(flightid=2, timestamp_ms=2_000, lon=0.1),
+                        Flight(flightid=3, timestamp_ms=1_000, lon=1),
+                    ],
+                    timestamp=11,
+                ),
+                elapsed=0.2,
+                num_flights=2,
+            ),
+        ]
+    )
+    assert result.timestamp == 10
+
+    df = result.to_polars()
+    assert df.schema == pl.Schema(live_feed_schema)
+    assert df["flightid"].to_list() == [1, 2, 3]
+    assert df.filter(pl.col("flightid") == 2)["longitude"].item() > 0
+
+    stats = result.tile_stats()
+    assert stats["num_flights"].to_list() == [2, 2]
+    assert stats["elapsed"].to_list() == [0.1, 0.2]
+
+
+def mock_live_feed(flights: list[Flight]) -> httpx.MockTransport:
+    """Serve the flights within the requested bounds, up to the limit."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = parse_data(request.content, LiveFeedRequest).unwrap()
+        b = message.bounds
+        matches = [
+            f
+            for f in flights
+            if b.south <= f.lat < b.north and b.west <= f.lon < b.east
+        ]
+        return httpx.Response(
+            200,
+            content=encode_message(
+                LiveFeedResponse(
+                    flights_list=matches[: message.limit], server_time_ms=1
+                )
+            ),
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.anyio
+async def test_live_feed_world_split_saturated() -> None:
+    flights = [
+        Flight(flightid=i, lat=10 + i * 0.5, lon=10 + i * 0.5)
+        for i in range(30)
+    ] + [Flight(flightid=100, lat=-45, lon=-100)]
+    client = httpx.AsyncClient(transport=mock_live_feed(flights))
+    tiler = AdaptiveTiler(
+        [BoundingBox(-90, 90, -180, 0), BoundingBox(-90, 90, 0, 180)],
+        merge_ratio=1.0,
+    )
+    async with FR24(client=client, ratelimiter=None) as fr24:
+        result = await fr24.live_feed.fetch_world(tiler, limit=10)
+    df = result.to_polars()
+    assert df.height == len(flights)
+    assert all(tile.num_flights < 10 for tile in result.tiles)
+    assert len(result.tiles) > 2
+
+    tiling = tiler.tiles(result.timestamp)
+    assert len(tiling) < len(result.tiles)  # sparse neighbours merged
+    area = sum((b.north - b.south) * (b.east - b.west) for b in tiling)
+    assert area == 180 * 360
+
+
+@pytest.mark.anyio
+async def test_live_feed_world_failed_tiles() -> None:
+    live_feed = mock_live_feed([Flight(flightid=1, lat=10, lon=10)])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bounds = parse_data(request.content, LiveFeedRequest).unwrap().bounds
+        if bounds.west == -180:
+            raise httpx.ConnectError("unreachable", request=request)
+        if bounds.south == -90:
+            return httpx.Response(
+                200, content=b"\x80\x00\x00\x00\x0fgrpc-status:8\r\n"
+            )
+        return live_feed.handle_request(request)
+
+    bounding_boxes = [
+        BoundingBox(-90, 0, -180, 0),
+        BoundingBox(-90, 0, 0, 180),
+        BoundingBox(0, 90, 0, 180),
+    ]
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with FR24(client=client, ratelimiter=None) as fr24:
+        result = await fr24.live_feed.fetch_world(bounding_boxes)
+    assert [tile.bounding_box for tile in result.tiles] == bounding_boxes[2:]
+    assert sorted(e.request.bounding_box for e in result.failed) == sorted(
+        bounding_boxes[:2]
+    )
+    assert result.to_polars()["flightid"].to_list() == [1]
+
+
+@pytest.mark.anyio
+async def test_live_feed_world_all_tiles_failed(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("unreachable", request=request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with FR24(client=client, ratelimiter=None) as fr24:
+        result = await fr24.live_feed.fetch_world(
+            [BoundingBox(-90, 90, -180, 180)]
+        )
+    assert not result.tiles and len(result.failed) == 1
+    assert result.to_polars().is_empty()
+    with pytest.raises(ValueError, match="all 1 tiles failed"):
+        result.write_table(FR24Cache(tmp_path))
+
+
+@pytest.mark.anyio
+async def test_follow_flight_stream_reassembles_frames() -> None:
+    msgs = [
+        FollowFlightResponse(flight_info=ExtendedFlightInfo(flightid=i))
+        for i in range(1, 6)
+    ]
+    body = b"".join(encode_message(msg) for msg in msgs)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for i in range(0, len(body), 4):  # split across and within messages
+            yield body[i : i + 4]
+
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=chunks())
+    )
+    async with FR24(
+        client=httpx.AsyncClient(transport=transport), ratelimiter=None
+    ) as fr24:
+        results = [r async for r in fr24.follow_flight.stream(flight_id=1)]
+    assert [r.to_proto() for r in results] == msgs
+
+
+@pytest.mark.anyio
+async def test_follow_many_reconnect_and_remove() -> None:
+    attempts: dict[int, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        req = parse_data(request.content, FollowFlightRequest).unwrap()
+        fid = req.flight_id
+        attempts[fid] = attempts.get(fid, 0) + 1
+        if fid == 2 and attempts[fid] == 1:
+            raise httpx.ConnectError("connection reset", request=request)
+        if fid == 3:  # never live
+            return httpx.Response(200, content=b"")
+        msg = FollowFlightResponse(
+            flight_info=ExtendedFlightInfo(
+                flightid=fid, timestamp_ms=attempts[fid] * 1000
+            )
+        )
+        return httpx.Response(200, content=encode_message(msg))
+
+    transport = httpx.MockTransport(handler)
+    async with FR24(
+        client=httpx.AsyncClient(transport=transport), ratelimiter=None
+    ) as fr24:
+        async with fr24.follow_flight.follow_many(
+            [1, 2, 3], backoff_base=0.001, max_retries=2
+        ) as mux:
+            received: dict[int, int] = {}
+            async for result in mux:
+                fid = result.to_proto().flight_info.flightid
+                received[fid] = received.get(fid, 0) + 1
+                if received.get(1, 0) >= 3 and received.get(2, 0) >= 3:
+                    mux.remove(1)
+                    mux.remove(2)
+            assert not mux.flight_ids
+    assert mux.stats[2].num_errors >= 1
+    assert mux.stats[2].num_messages >= 3
+    assert mux.stats[2].lag is not None
+    assert mux.stats[3].num_messages == 0
+    assert attempts[3] == 3  # initial attempt + 2 retries
+
+
+@pytest.mark.anyio
+async def test_fetch_many_concurrency_and_errors() -> None:
+    in_flight = max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        flight_id = int(request.url.params["flightId"], 16)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 * (10 - flight_id))
+        in_flight -= 1
+        if flight_id == 3:
+            raise httpx.ConnectError("connection reset", request=request)
+        return httpx.Response(200, json={"result": {}})
+
+    transport = httpx.MockTransport(handler)
+    async with FR24(
+        client=httpx.AsyncClient(transport=transport), ratelimiter=None
+    ) as fr24:
+        results = [
+            result
+            async for result in fr24.playback.fetch_many(
+                (PlaybackParams(flight_id=i) for i in range(10)),
+                concurrency=3,
+            )
+        ]
+    assert max_in_flight == 3
+    assert len(results) == 10
+    errors = [e for r in results if (e := r.err()) is not None]
+    assert len(errors) == 1
+    assert errors[0].request.flight_id == 3
+    assert isinstance(errors[0].error, httpx.ConnectError)
+    ok = [r.unwrap().request.flight_id for r in results if r.is_ok()]
+    assert sorted(ok) == [i for i in range(10) if i != 3]
+    assert ok != sorted(ok)  # completion order
+
+
+@pytest.mark.anyio
+async def test_token_bucket() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.anyio
+async def test_ratelimiter_backoff() -> None:
+    statuses = iter([200, 429, 464, 200, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses))
+
+    ratelimiter = RateLimiter(
+        {"example.com": (100.0, 200.0)},
+        max_retries=0,
+        backoff_base=0.05,
+        backoff_max=0.1,
+    )
+    bucket = ratelimiter.buckets["example.com"]
+    async with httpx.AsyncClient(
+        transport=ratelimiter.transport(httpx.MockTransport(handler))
+    ) as client:
+        await client.get("https://example.com")
+        assert bucket.rate == 105
+        await client.get("https://example.com")
+        await client.get("https://example.com")
+        assert bucket.num_throttled == 2
+        assert bucket.rate == 105 / 4
+        start = time.monotonic()
+        await client.get("https://example.com")  # held back
+        assert time.monotonic() - start >= 0.04
+        assert bucket.num_throttled == 0
+        await client.get("https://example.org")  # not limited
+
+
+@pytest.mark.anyio
+async def test_ratelimiter_retries_throttled() -> None:
+    statuses = iter([429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), headers={"retry-after": "0"})
+
+    ratelimiter = RateLimiter(
+        {"example.com": (100.0, 200.0)}, backoff_base=0.05, backoff_max=0.1
+    )
+    bucket = ratelimiter.buckets["example.com"]
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    ) as client:
+        FR24(client=client)  # not installed by default
+        assert isinstance(client._transport, httpx.MockTransport)
+        FR24(client=client, ratelimiter=ratelimiter)
+        transport = client._transport
+        ratelimiter.install(client)
+        assert client._transport is transport
+        start = time.monotonic()
+        response = await client.get("https://example.com")
+        assert response.status_code == 200
+        assert time.monotonic() - start >= 0.025
+        assert bucket.num_throttled == 0
+        assert bucket.rate == 50 + 5
+
+
+@pytest.mark.anyio
+async def test_response_cache_read_through(tmp_path: Path) -> None:
+    num_requests = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal num_requests
+        num_requests += 1
+        if request.url.host == "data-feed.flightradar24.com":
+            return httpx.Response(
+                200,
+                content=encode_message(LiveFeedResponse(server_time_ms=1)),
+                headers={"date": "Wed, 01 Jan 2025 00:00:00 GMT"},
+            )
+        if request.url.params["flightId"] == "dead":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"result": {"response": {}}})
+
+    cache = FR24Cache(tmp_path)
+    responses = cache.responses
+    async with FR24(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ratelimiter=None,
+        response_cache=responses,
+    ) as fr24:
+        first = await fr24.playback.fetch(flight_id=0x2D1E0A03)
+        second = await fr24.playback.fetch(flight_id=0x2D1E0A03)
+        assert num_requests == 1
+        assert first.to_dict() == second.to_dict()
+
+        await fr24.playback.fetch(flight_id=0xDEAD)  # errors are not cached
+        await fr24.playback.fetch(flight_id=0xDEAD)
+        assert num_requests == 3
+
+        bbox = BoundingBox(-90, 90, -180, 180)
+        live = await fr24.live_feed.fetch(bounding_box=bbox)
+        cached = await fr24.live_feed.fetch(bounding_box=bbox)
+        assert num_requests == 4
+        assert cached.timestamp == live.timestamp == 1735689600
+        assert cached.to_proto() == live.to_proto()
+
+        responses.ttl["live_feed"] = 0  # type: ignore[index]
+        time.sleep(0.01)
+        await fr24.live_feed.fetch(bounding_box=bbox)
+        assert num_requests == 5
+
+
+def test_response_cache_ttl(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path)
+    bbox = BoundingBox(0, 1, 0, 1)
+    now = int(time.time())
+    assert cache.get_ttl("live_feed", LiveFeedParams(bbox)) == 5
+    historic = PlaybackParams(flight_id=1, timestamp=now - 7 * 86400)
+    assert cache.get_ttl("playback", historic) is None
+    live_playback = LiveFeedPlaybackParams(bbox)  # timestamp="now"
+    for request in (
+        PlaybackParams(flight_id=1),
+        PlaybackParams(flight_id=1, timestamp=now - 3600),
+        live_playback,
+    ):
+        assert cache.get_ttl("playback", request) == cache.unsettled_ttl
+
+    response = httpx.Response(200, content=b"\x00cached")
+    cache.put("live_feed_playback", live_playback, response)
+    assert cache.get("live_feed_playback", live_playback) is not None
+    cache = replace(cache, unsettled_ttl=0)
+    time.sleep(0.01)
+    assert cache.get("live_feed_playback", live_playback) is None
+
+
+def test_response_cache_shared_across_processes(tmp_path: Path) -> None:
+    fields: set[LiveFeedField] = {"flight", "reg", "route", "type", "squawk"}
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "import httpx\n"
+        "from fr24.cache import ResponseCache\n"
+        "from fr24.grpc import BoundingBox, LiveFeedParams\n"
+        f"params = LiveFeedParams(BoundingBox(1, 2, 3, 4), fields={fields!r})\n"
+        "response = httpx.Response(200, content=b'\\x00cached')\n"
+        "ResponseCache(Path(sys.argv[1])).put('live_feed', params, response)\n"
+    )
+    for seed in range(4):
+        subprocess.run(
+            [sys.executable, "-c", code, str(tmp_path)],
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+            check=True,
+        )
+    params = LiveFeedParams(BoundingBox(1, 2, 3, 4), fields=fields)
+    cached = ResponseCache(tmp_path).get("live_feed", params)
+    assert cached is not None and cached.content == b"\x00cached"
+    assert len(list(tmp_path.glob("live_feed/*.bin"))) == 1
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_result_uses_grpc_encoding_header(encoding: GrpcEncoding) -> None:
+    message = LiveFeedResponse(flights_list=[Flight(flightid=1)])
+    result = LiveFeedResult(
+        request=LiveFeedParams(bounding_box=BoundingBox(-90, 90, -180, 180)),
+        response=httpx.Response(
+            200,
+            content=encode_message(message, encoding),
+            headers={"grpc-encoding": encoding},
+        ),
+        timestamp=10,
+    )
+    assert result.to_proto() == message
+
+
+def test_result_conversions_are_memoized() -> None:
+    result = make_live_feed_result(
+        BoundingBox(-90, 90, -180, 180), [Flight(flightid=1)], timestamp=10
+    )
+    assert result.to_proto() is result.to_proto()
+    assert result.to_dict() is result.to_dict()
+    assert result.to_polars() is result.to_polars()
+    assert "_parsed" not in repr(result)
+
+
+def make_flight_list_item(flight_id: str | None, stod: int | None) -> Any:
+    times = {"departure": stod, "arrival": None}
+    return {
+        "identification": {
+            "id": flight_id,
+            "number": {"default": "CX8747"},
+            "callsign": "CPA8747",
+        },
+        "status": {"text": "Scheduled"},
+        "aircraft": {
+            "hex": "78a1b2",
+            "registration": "B-HPB",
+            "model": {"code": "A359"},
+        },
+        "airport": {"origin": None, "destination": {"code": {"icao": "VHHH"}}},
+        "time": {"scheduled": times, "estimated": times, "real": times},
+    }
+
+
+def make_flight_list_page(items: list[Any], more: bool = False) -> Any:
+    return {
+        "result": {
+            "request": {},
+            "response": {"page": {"more": more}, "data": items},
+        }
+    }
+
+
+def make_flight_list_result(flight_ids: list[str]) -> FlightListResult:
+    data = make_flight_list_page(
+        [make_flight_list_item(fid, i) for i, fid in enumerate(flight_ids)]
+    )
+    return FlightListResult(
+        request=FlightListParams(reg="B-HPB"),
+        response=httpx.Response(200, json=data),
+    )
+
+
+def test_flight_list_collection_keeps_pages() -> None:
+    results = FlightListResultCollection(
+        [make_flight_list_result(["a", "b"]), make_flight_list_result(["c"])]
+    )
+    merged = results.to_dict()["result"]["response"]["data"]
+    assert merged is not None
+    assert [f["identification"]["id"] for f in merged] == ["a", "b", "c"]
+    first = results[0].to_dict()["result"]["response"]["data"]
+    assert first is not None
+    assert [f["identification"]["id"] for f in first] == ["a", "b"]
+
+
+def test_slim_result(tmp_path: Path) -> None:
+    result = make_live_feed_result(
+        BoundingBox(-90, 90, -180, 180),
+        [Flight(flightid=1), Flight(flightid=2)],
+        timestamp=10,
+    )
+    slim = result.slim()
+    assert slim.response.content == b""
+    assert slim.request == result.request
+    assert slim.timestamp == 10
+    assert slim.to_polars().equals(result.to_polars())
+    assert slim.table_metadata() == result.table_metadata()
+
+    cache = FR24Cache(tmp_path)
+    slim.write_table(cache)
+    assert cache.live_feed.scan_table(10).collect().height == 2
+
+
+def test_flight_list_collection_to_polars() -> None:
+    results = FlightListResultCollection(
+        [make_flight_list_result(["a", "b"]), make_flight_list_result(["c"])]
+    )
+    df = results.to_polars()
+    # ("a", 0) is repeated by ("c", 0), but not ("b", 1)
+    assert df["flight_id"].to_list() == [0xA, 0xB, 0xC]
+    results.append(make_flight_list_result(["a", "b"]))
+    assert_frame_equal(results.to_polars(), df)
+    assert_frame_equal(results.to_polars(), flight_list_df(results.to_dict()))
+
+
+@pytest.mark.anyio
+async def test_flight_list_sink_all(tmp_path: Path) -> None:
+    pages = [
+        [make_flight_list_item("c", 30), make_flight_list_item("b", 20)],
+        # the next page starts at the earliest STOD, so "b" is repeated
+        [make_flight_list_item("b", 20), make_flight_list_item("a", 10)],
+        [
+            make_flight_list_item(None, None),
+            make_flight_list_item(None, None),
+            make_flight_list_item("d", 5),
+        ],
+    ]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        return httpx.Response(
+            200, json=make_flight_list_page(pages[page - 1], page < 3)
+        )
+
+    cache = FR24Cache(tmp_path)
+    async with FR24(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ratelimiter=None,
+    ) as fr24:
+        num_rows = await fr24.flight_list.sink_all(cache, reg="B-HPB")
+    assert num_rows == 6
+    df = cache.flight_list.reg.scan_table("B-HPB").collect()
+    assert df["flight_id"].to_list() == [0xC, 0xB, 0xA, None, None, 0xD]
+    assert [f.name for f in cache.flight_list.reg.query()] == ["B-HPB.parquet"]
+
+
+@pytest.mark.anyio
+async def test_flight_list_crawl_resumes(tmp_path: Path) -> None:
+    requested: list[str] = []
+    fail = {"B-BAD"}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        reg = request.url.params["query"]
+        page = int(request.url.params["page"])
+        requested.append(reg)
+        if reg in fail:
+            raise httpx.ConnectError("connection reset", request=request)
+        items = [make_flight_list_item(f"{reg[-1]}{page}", 100 - page)]
+        return httpx.Response(
+            200, json=make_flight_list_page(items, more=page < 2)
+        )
+
+    cache = FR24Cache(tmp_path)
+    regs = ["B-HPA", "B-HPB", "B-BAD", "B-HPA"]
+    async with FR24(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ratelimiter=None,
+    ) as fr24:
+        stats = await fr24.flight_list.crawl(regs, cache, concurrency=2)
+        assert stats.num_idents == 3
+        assert stats.num_done == 2
+        assert stats.num_pages == 4
+        assert stats.num_rows == 4
+        assert set(stats.failed) == {"B-BAD"}
+        assert stats.pages_per_second > 0
+        df = cache.flight_list.reg.scan_table("B-HPB").collect()
+        assert df["flight_id"].to_list() == [0xB1, 0xB2]
+
+        requested.clear()
+        fail.clear()
+        stats = await fr24.flight_list.crawl(regs, cache)
+    assert stats.num_skipped == 2
+    assert stats.num_done == 1
+    assert set(requested) == {"B-BAD"}
+    assert cache.flight_list.reg.scan_table("B-BAD").collect().height == 2